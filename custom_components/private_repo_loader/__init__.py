@@ -6,21 +6,36 @@ and proper linking from the integrations page.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime
+from typing import Any
 
 from homeassistant.const import Platform
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.core import CoreState, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.components.persistent_notification import async_create
 
 from .const import (
     DOMAIN,
+    CONF_REPO,
+    CONF_REPOS,
     CONF_SLUG,
+    CONF_BRANCH,
+    CONF_TOKEN,
+    DEFAULT_BRANCH,
+    DATA_COORDINATORS,
     SERVICE_SYNC_NOW,
     SERVICE_RELOAD_REPOS,
 )
-from .coordinator import PrivateRepoCoordinator
+from .coordinator import (
+    PrivateRepoCoordinator,
+    async_shutdown_sync_executor,
+    calculate_startup_delay,
+)
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = [Platform.SENSOR, Platform.UPDATE, Platform.BUTTON]
@@ -29,22 +44,47 @@ type PrivateRepoConfigEntry = ConfigEntry[PrivateRepoCoordinator]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """Set up the Private Repo Loader integration."""
+    """Set up the Private Repo Loader integration.
+
+    Services are registered once here and act on every loaded entry, so
+    they are not re-registered each time an entry is set up or reloaded.
+    """
+    _async_register_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: PrivateRepoConfigEntry) -> bool:
     """Set up a private repository from a config entry."""
-    coordinator = PrivateRepoCoordinator(hass, entry)
+    if not entry.data.get(CONF_REPO):
+        # Emptied by async_migrate_entry and about to be removed
+        return True
 
-    # Initial refresh
-    await coordinator.async_config_entry_first_refresh()
+    running = hass.state is CoreState.running
+    coordinator = PrivateRepoCoordinator(hass, entry, defer_polling=not running)
+
+    if running:
+        # Entry added at runtime: sync now so setup errors surface in the flow
+        await coordinator.async_config_entry_first_refresh()
+        _async_notify_sync_result(hass, entry, coordinator.data)
+    else:
+        # Cloning can take a while; keep it out of Home Assistant's startup.
+        # Polling only starts once this first sync has run, so the polls of
+        # different repositories stay as far apart as their first syncs.
+        async def _async_first_sync(_now: datetime) -> None:
+            await coordinator.async_first_sync()
+            _async_notify_sync_result(hass, entry, coordinator.data)
+
+        @callback
+        def _async_schedule_first_sync(hass: HomeAssistant) -> None:
+            delay = calculate_startup_delay(coordinator.repo_url)
+            entry.async_on_unload(async_call_later(hass, delay, _async_first_sync))
+
+        entry.async_on_unload(async_at_started(hass, _async_schedule_first_sync))
 
     # Store coordinator in entry runtime data
     entry.runtime_data = coordinator
-
-    # Register services if not already registered
-    await _async_register_services(hass)
+    coordinators = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    coordinators[entry.entry_id] = coordinator
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -52,17 +92,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: PrivateRepoConfigEntry)
     # Listen for options updates
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    slug = entry.data.get(CONF_SLUG, "unknown")
-    poll_interval = coordinator.current_poll_interval
-
     _LOGGER.info(
         "Private Repo Loader entry set up for %s with poll interval %d minutes",
-        slug,
-        poll_interval,
+        entry.data.get(CONF_SLUG, "unknown"),
+        coordinator.current_poll_interval,
     )
 
+    return True
+
+
+@callback
+def _async_notify_sync_result(
+    hass: HomeAssistant,
+    entry: PrivateRepoConfigEntry,
+    data: dict[str, Any] | None,
+) -> None:
+    """Tell the user a restart is needed after the initial sync changed files."""
+    slug = entry.data.get(CONF_SLUG, "unknown")
+
     # Check if the initial sync resulted in changes (new clone)
-    if coordinator.data and coordinator.data.get("status") == "cloned":
+    if data and data.get("status") == "cloned":
         # Create a persistent notification for restart
         # Note: async_create is a synchronous function despite its name
         async_create(
@@ -80,7 +129,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: PrivateRepoConfigEntry)
             "Repository %s cloned. Home Assistant restart required to load component.",
             slug,
         )
-    elif coordinator.data and coordinator.data.get("status") == "updated":
+    elif data and data.get("status") == "updated":
         # Notify about update (restart also needed for code changes)
         # Note: async_create is a synchronous function despite its name
         async_create(
@@ -96,54 +145,80 @@ async def async_setup_entry(hass: HomeAssistant, entry: PrivateRepoConfigEntry)
         )
         _LOGGER.info("Repository %s updated.", slug)
 
-    return True
-
 
 async def _async_update_listener(
     hass: HomeAssistant, entry: PrivateRepoConfigEntry
 ) -> None:
-    """Handle options update."""
+    """Handle options update.
+
+    The coordinator also writes sync state to entry.data, which fires this
+    listener too; only an options change needs the entry reloaded.
+    """
+    if entry.options == entry.runtime_data.loaded_options:
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
-async def _async_register_services(hass: HomeAssistant) -> None:
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services."""
-    if hass.services.has_service(DOMAIN, SERVICE_SYNC_NOW):
-        return
 
     async def _handle_sync_now(call: ServiceCall) -> None:
         """Handle sync_now service call."""
-        entries = hass.config_entries.async_entries(DOMAIN)
-        for entry in entries:
-            if hasattr(entry, "runtime_data") and entry.runtime_data:
-                coordinator: PrivateRepoCoordinator = entry.runtime_data
-                await coordinator.async_request_refresh()
+        await asyncio.gather(
+            *(
+                coordinator.async_request_refresh()
+                for coordinator in _loaded_coordinators(hass)
+            )
+        )
 
     async def _handle_reload_repos(call: ServiceCall) -> None:
         """Handle reload_repos service call - force refresh all repos."""
-        entries = hass.config_entries.async_entries(DOMAIN)
-        for entry in entries:
-            if hasattr(entry, "runtime_data") and entry.runtime_data:
-                coordinator: PrivateRepoCoordinator = entry.runtime_data
-                await coordinator.async_force_sync()
+        coordinators = _loaded_coordinators(hass)
+        # Git work is bounded by the sync thread pool, so every repo can be
+        # submitted at once; one failing repo must not cancel the others.
+        results = await asyncio.gather(
+            *(coordinator.async_force_sync() for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        failures = [
+            f"{coordinator.repo_slug}: {result}"
+            for coordinator, result in zip(coordinators, results)
+            if isinstance(result, BaseException)
+        ]
+        if failures:
+            # One record for the batch, so an outage does not log once per repo
+            _LOGGER.error(
+                "Failed to reload %d repositories: %s",
+                len(failures),
+                "; ".join(failures),
+            )
 
     hass.services.async_register(DOMAIN, SERVICE_SYNC_NOW, _handle_sync_now)
     hass.services.async_register(DOMAIN, SERVICE_RELOAD_REPOS, _handle_reload_repos)
 
 
+def _loaded_coordinators(hass: HomeAssistant) -> list[PrivateRepoCoordinator]:
+    """Return the coordinators of all loaded repository entries."""
+    return list(hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {}).values())
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: PrivateRepoConfigEntry
 ) -> bool:
     """Unload a config entry."""
+    if not entry.data.get(CONF_REPO):
+        # Nothing was set up for an entry emptied by async_migrate_entry
+        return True
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    # Remove services if this was the last entry
-    entries = hass.config_entries.async_entries(DOMAIN)
-    if len(entries) <= 1:  # Current entry being unloaded is still in the list
-        if hass.services.has_service(DOMAIN, SERVICE_SYNC_NOW):
-            hass.services.async_remove(DOMAIN, SERVICE_SYNC_NOW)
-        if hass.services.has_service(DOMAIN, SERVICE_RELOAD_REPOS):
-            hass.services.async_remove(DOMAIN, SERVICE_RELOAD_REPOS)
+    if unload_ok:
+        coordinators = hass.data[DOMAIN][DATA_COORDINATORS]
+        coordinators.pop(entry.entry_id, None)
+        # Shut down the sync pool once no entries are left to use it
+        if not coordinators:
+            async_shutdown_sync_executor(hass)
 
     return unload_ok
 
@@ -157,14 +232,33 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     _LOGGER.debug("Migrating from version %s", config_entry.version)
 
     if config_entry.version == 1:
-        # Migration from V1 to V2 requires manual reconfiguration
-        # as we can't automatically create multiple entries from one
-        _LOGGER.warning(
-            "Private Repo Loader config entry is outdated (v1). "
-            "Please remove and re-add your repositories."
+        # Split the repositories into version 2 entries through import flows
+        token = config_entry.data.get(CONF_TOKEN, "")
+        for repo in config_entry.options.get(CONF_REPOS, []):
+            if not repo.get(CONF_REPO):
+                continue
+            await hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={
+                    CONF_REPO: repo[CONF_REPO],
+                    CONF_SLUG: repo.get(CONF_SLUG, ""),
+                    CONF_BRANCH: repo.get(CONF_BRANCH, DEFAULT_BRANCH),
+                    CONF_TOKEN: repo.get(CONF_TOKEN) or token,
+                },
+            )
+
+        # The old entry is left without repositories. It cannot be removed
+        # from here: removal waits for the entry's setup lock, which is held
+        # until migration and setup have finished. So it is emptied, which
+        # setup skips, and its removal is queued to run right after setup.
+        hass.config_entries.async_update_entry(
+            config_entry, data={}, options={}, version=2
         )
-        # We still return True to allow the entry to load, but it won't work correctly
-        # The user needs to delete and re-add repos
-        return True
+        hass.async_create_task(
+            hass.config_entries.async_remove(config_entry.entry_id),
+            f"{DOMAIN} remove migrated version 1 entry",
+        )
+        _LOGGER.info("Private Repo Loader v1 entry split into one entry per repository")
 
     return True
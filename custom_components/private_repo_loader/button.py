@@ -5,12 +5,20 @@ from __future__ import annotations
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, CONF_SLUG, CONF_REPO
 from .coordinator import PrivateRepoCoordinator
 
+SYNC_BUTTON_DESCRIPTION = ButtonEntityDescription(
+    key="sync", translation_key="sync", icon="mdi:sync"
+)
+RESTART_BUTTON_DESCRIPTION = ButtonEntityDescription(
+    key="restart", translation_key="restart", icon="mdi:restart"
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -19,48 +27,52 @@ async def async_setup_entry(
 ) -> None:
     """Set up button entities for a repository."""
     coordinator: PrivateRepoCoordinator = entry.runtime_data
+    device_info = repo_device_info(entry)
 
     async_add_entities(
         [
-            RepoSyncButton(coordinator, entry),
-            RestartHAButton(coordinator, entry),
+            RepoSyncButton(coordinator, entry, device_info),
+            RestartHAButton(coordinator, entry, device_info),
         ]
     )
 
 
+def repo_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device info shared by a repository's buttons."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=f"Private Repo: {entry.data.get(CONF_SLUG, 'unknown')}",
+        manufacturer="Private Repo Loader",
+        model="GitHub Repository",
+        configuration_url=entry.data.get(CONF_REPO),
+    )
+
+
 class RepoSyncButton(CoordinatorEntity[PrivateRepoCoordinator], ButtonEntity):
     """Button to trigger repository sync."""
 
+    _attr_has_entity_name = True
+    entity_description = SYNC_BUTTON_DESCRIPTION
+
     def __init__(
         self,
         coordinator: PrivateRepoCoordinator,
         entry: ConfigEntry,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the sync button."""
         super().__init__(coordinator)
-        self._entry = entry
-
-        slug = entry.data.get(CONF_SLUG, "unknown")
-        self._attr_unique_id = f"{entry.entry_id}_sync"
-        self._attr_name = f"{slug} Sync Now"
-        self._attr_icon = "mdi:sync"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": f"Private Repo: {slug}",
-            "manufacturer": "Private Repo Loader",
-            "model": "GitHub Repository",
-            "configuration_url": entry.data.get(CONF_REPO),
-        }
-
-        self.entity_description = ButtonEntityDescription(
-            key="sync",
-            name=f"{slug} Sync Now",
-            icon="mdi:sync",
-        )
+
+        self._attr_unique_id = f"{entry.entry_id}_{self.entity_description.key}"
+        self._attr_device_info = device_info
 
     async def async_press(self) -> None:
-        """Handle the button press - trigger sync."""
-        await self.coordinator.async_request_refresh()
+        """Handle the button press - trigger sync.
+
+        Refreshes right away instead of through the request debouncer; a
+        press while a sync is running shares that sync's result.
+        """
+        await self.coordinator.async_refresh()
 
 
 class RestartHAButton(CoordinatorEntity[PrivateRepoCoordinator], ButtonEntity):
@@ -70,32 +82,20 @@ class RestartHAButton(CoordinatorEntity[PrivateRepoCoordinator], ButtonEntity):
     to be applied by restarting Home Assistant.
     """
 
+    _attr_has_entity_name = True
+    entity_description = RESTART_BUTTON_DESCRIPTION
+
     def __init__(
         self,
         coordinator: PrivateRepoCoordinator,
         entry: ConfigEntry,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize the restart button."""
         super().__init__(coordinator)
-        self._entry = entry
-
-        slug = entry.data.get(CONF_SLUG, "unknown")
-        self._attr_unique_id = f"{entry.entry_id}_restart"
-        self._attr_name = f"{slug} Restart HA"
-        self._attr_icon = "mdi:restart"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": f"Private Repo: {slug}",
-            "manufacturer": "Private Repo Loader",
-            "model": "GitHub Repository",
-            "configuration_url": entry.data.get(CONF_REPO),
-        }
-
-        self.entity_description = ButtonEntityDescription(
-            key="restart",
-            name=f"{slug} Restart HA",
-            icon="mdi:restart",
-        )
+
+        self._attr_unique_id = f"{entry.entry_id}_{self.entity_description.key}"
+        self._attr_device_info = device_info
 
     async def async_press(self) -> None:
         """Handle the button press - restart Home Assistant."""
@@ -6,13 +6,22 @@ and proper linking from the integrations page.
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import time
 import voluptuous as vol
+from collections import OrderedDict
 from typing import Any
 
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
+)
 
 from .const import (
     DOMAIN,
@@ -21,6 +30,7 @@ from .const import (
     CONF_BRANCH,
     CONF_SLUG,
     CONF_POLL_INTERVAL,
+    CONF_FULL_HISTORY,
     DEFAULT_BRANCH,
     DEFAULT_POLL_INTERVAL,
 )
@@ -30,12 +40,115 @@ from .github_api import (
     list_user_repos,
     parse_github_url,
     GitHubError,
+    GitHubRepoInfo,
+    invalidate_token_cache,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Schemas and validators that do not depend on flow state are built once
+TOKEN_SELECTOR = TextSelector(TextSelectorConfig(type=TextSelectorType.PASSWORD))
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_TOKEN, default=""): TOKEN_SELECTOR,
+    }
+)
+POLL_INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=60))
+# The token entered in the first step is suggested when the form is shown
+STEP_MANUAL_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_REPO): str,
+        vol.Optional(CONF_SLUG, default=""): str,
+        vol.Optional(CONF_BRANCH, default=DEFAULT_BRANCH): str,
+        vol.Optional(CONF_TOKEN): TOKEN_SELECTOR,
+        vol.Optional(
+            CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL
+        ): POLL_INTERVAL_VALIDATOR,
+    }
+)
+# Current option values are filled in as suggested values on each render;
+# defaults apply to fields the user cleared
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_BRANCH, default=DEFAULT_BRANCH): vol.All(str, vol.Strip),
+        vol.Optional(CONF_TOKEN, default=""): vol.All(TOKEN_SELECTOR, vol.Strip),
+        vol.Optional(
+            CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL
+        ): POLL_INTERVAL_VALIDATOR,
+        vol.Optional(CONF_FULL_HISTORY, default=False): bool,
+    }
+)
+
+
+# Form field and error key for each way a token or repository check fails
+_TOKEN_ERRORS: dict[GitHubError, tuple[str, str]] = {
+    GitHubError.INVALID_TOKEN: (CONF_TOKEN, "invalid_token"),
+    GitHubError.RATE_LIMITED: (CONF_TOKEN, "rate_limited"),
+    GitHubError.NETWORK_ERROR: ("base", "network_error"),
+}
+_TOKEN_ERROR_DEFAULT = (CONF_TOKEN, "unknown_error")
+_REPO_ERRORS: dict[GitHubError, tuple[str, str]] = {
+    GitHubError.REPO_NOT_FOUND: (CONF_REPO, "repo_not_found"),
+    GitHubError.INVALID_TOKEN: (CONF_TOKEN, "invalid_token"),
+    GitHubError.INSUFFICIENT_PERMISSIONS: (CONF_TOKEN, "insufficient_permissions"),
+    GitHubError.RATE_LIMITED: ("base", "rate_limited"),
+}
+_REPO_ERROR_DEFAULT = ("base", "validation_failed")
+
+
+# Validated tokens with their username and repositories, so that going
+# back to the token step does not query GitHub again. Keyed by a hash so
+# the token itself is not kept around.
+TOKEN_CACHE_TTL = 60.0
+TOKEN_CACHE_SIZE = 8
+_token_cache: OrderedDict[str, tuple[float, str | None, list[GitHubRepoInfo]]] = (
+    OrderedDict()
+)
+
+
+def _token_cache_key(token: str) -> str:
+    """Return the token cache key for a token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
-def _generate_unique_id(repo_url: str, slug: str) -> str:
+def _get_cached_token(token: str) -> tuple[str | None, list[GitHubRepoInfo]] | None:
+    """Return the cached username and repositories for a token, if fresh."""
+    key = _token_cache_key(token)
+    cached = _token_cache.get(key)
+    if cached is None:
+        return None
+    stored_at, username, repos = cached
+    if time.monotonic() - stored_at >= TOKEN_CACHE_TTL:
+        del _token_cache[key]
+        return None
+    _token_cache.move_to_end(key)
+    return username, repos
+
+
+def _cache_token(token: str, username: str | None, repos: list[GitHubRepoInfo]) -> None:
+    """Remember a validated token's username and repositories."""
+    key = _token_cache_key(token)
+    _token_cache[key] = (time.monotonic(), username, repos)
+    _token_cache.move_to_end(key)
+    while len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+
+
+# Text fields of the manual step, in the order _strip_manual_fields returns
+_MANUAL_TEXT_FIELDS = (CONF_REPO, CONF_SLUG, CONF_BRANCH, CONF_TOKEN)
+
+
+def _strip_manual_fields(
+    user_input: dict[str, Any], defaults: dict[str, str]
+) -> tuple[str, ...]:
+    """Return the manual step's text fields with surrounding whitespace removed."""
+    return tuple(
+        str(user_input.get(key, defaults.get(key, ""))).strip()
+        for key in _MANUAL_TEXT_FIELDS
+    )
+
+
+def _generate_unique_id(slug: str) -> str:
     """Generate a unique ID for a repository entry."""
     return f"{DOMAIN}_{slug}"
 
@@ -58,6 +171,8 @@ class FlowHandler(
         """Initialize the flow handler."""
         self._token: str = ""
         self._available_repos: list[Any] = []
+        self._repos_by_name: dict[str, GitHubRepoInfo] = {}
+        self._select_schema: vol.Schema | None = None
         self._username: str | None = None
 
     async def async_step_user(
@@ -71,31 +186,43 @@ class FlowHandler(
             token = user_input.get(CONF_TOKEN, "").strip()
             self._token = token
 
+            cached = _get_cached_token(token) if token else None
+            if cached is not None:
+                self._username, repos = cached
+                self._set_available_repos(repos)
+                return await self.async_step_select_repo()
+
             if token:
-                # Validate the token
-                result = await validate_token(token)
+                # Fetch available repos while the token is validated, which
+                # saves a round trip to GitHub when the token is good
+                session = async_get_clientsession(self.hass)
+                repos_task = self.hass.async_create_task(
+                    list_user_repos(session, token), f"{DOMAIN} list repositories"
+                )
+                try:
+                    result = await validate_token(session, token)
+                    if result.valid:
+                        self._set_available_repos(await repos_task)
+                finally:
+                    # The listing is not needed if the token is bad or the
+                    # validation did not finish
+                    repos_task.cancel()
+
                 if result.valid:
                     self._username = result.username
                     _LOGGER.info("GitHub token validated for user: %s", result.username)
 
-                    # Fetch available repos
-                    self._available_repos = await list_user_repos(token)
                     _LOGGER.info(
                         "Found %d repositories for user %s",
                         len(self._available_repos),
                         result.username,
                     )
+                    _cache_token(token, result.username, self._available_repos)
 
                     return await self.async_step_select_repo()
                 else:
-                    if result.error == GitHubError.INVALID_TOKEN:
-                        errors[CONF_TOKEN] = "invalid_token"
-                    elif result.error == GitHubError.RATE_LIMITED:
-                        errors[CONF_TOKEN] = "rate_limited"
-                    elif result.error == GitHubError.NETWORK_ERROR:
-                        errors["base"] = "network_error"
-                    else:
-                        errors[CONF_TOKEN] = "unknown_error"
+                    field, error = _TOKEN_ERRORS.get(result.error, _TOKEN_ERROR_DEFAULT)
+                    errors[field] = error
 
                     if result.error_message:
                         description_placeholders["error_detail"] = result.error_message
@@ -103,14 +230,9 @@ class FlowHandler(
                 # No token provided - go directly to manual entry
                 return await self.async_step_manual()
 
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_TOKEN, default=""): str,
-            }
-        )
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
+            data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
             description_placeholders=description_placeholders,
         )
@@ -129,10 +251,7 @@ class FlowHandler(
 
             if selected_repo:
                 # Find the selected repo in our list
-                repo_info = next(
-                    (r for r in self._available_repos if r.full_name == selected_repo),
-                    None,
-                )
+                repo_info = self._repos_by_name.get(selected_repo)
                 if repo_info:
                     repo_url = repo_info.clone_url
                     # Use the repo name as slug (last part of full_name)
@@ -144,7 +263,10 @@ class FlowHandler(
                     if parsed:
                         owner, repo = parsed
                         validation = await validate_repo_access(
-                            self._token, owner, repo
+                            async_get_clientsession(self.hass),
+                            self._token,
+                            owner,
+                            repo,
                         )
                         if not validation.valid:
                             _LOGGER.warning(
@@ -155,7 +277,7 @@ class FlowHandler(
                             errors["selected_repo"] = "repo_access_error"
 
                     if not errors:
-                        unique_id = _generate_unique_id(repo_url, slug)
+                        unique_id = _generate_unique_id(slug)
                         await self.async_set_unique_id(unique_id)
                         self._abort_if_unique_id_configured()
 
@@ -176,18 +298,11 @@ class FlowHandler(
             else:
                 errors["selected_repo"] = "required"
 
-        # Build the list of repos for selection
-        repo_options = {r.full_name: r.full_name for r in self._available_repos}
-        repo_options["__manual__"] = "Enter repository URL manually..."
-
-        schema = vol.Schema(
-            {
-                vol.Required("selected_repo"): vol.In(repo_options),
-            }
-        )
+        if self._select_schema is None:
+            self._set_available_repos(self._available_repos)
         return self.async_show_form(
             step_id="select_repo",
-            data_schema=schema,
+            data_schema=self._select_schema,
             errors=errors,
             description_placeholders={
                 "username": self._username or "Unknown",
@@ -195,6 +310,22 @@ class FlowHandler(
             },
         )
 
+    def _set_available_repos(self, repos: list[GitHubRepoInfo]) -> None:
+        """Store the user's repositories and build the selection schema.
+
+        The list is fixed for the rest of the flow, so the schema is built
+        once here rather than on every render of the selection form.
+        """
+        self._available_repos = repos
+        self._repos_by_name = {r.full_name: r for r in repos}
+        repo_options = {name: name for name in self._repos_by_name}
+        repo_options["__manual__"] = "Enter repository URL manually..."
+        self._select_schema = vol.Schema(
+            {
+                vol.Required("selected_repo"): vol.In(repo_options),
+            }
+        )
+
     async def async_step_manual(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -203,93 +334,135 @@ class FlowHandler(
         description_placeholders: dict[str, str] = {}
 
         if user_input is not None:
-            repo_url = user_input.get(CONF_REPO, "").strip()
-            slug = user_input.get(CONF_SLUG, "").strip()
-            branch = user_input.get(CONF_BRANCH, DEFAULT_BRANCH).strip()
-            token = user_input.get(CONF_TOKEN, self._token).strip()
-            poll_interval = user_input.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
-
-            if not repo_url:
-                errors[CONF_REPO] = "required"
-            elif not repo_url.startswith("https://"):
-                errors[CONF_REPO] = "invalid_url"
-
-            if not slug:
-                # Try to extract slug from URL
-                parsed = parse_github_url(repo_url)
-                if parsed:
-                    slug = parsed[1]
-                else:
-                    errors[CONF_SLUG] = "required"
-
-            # Validate repository access if we have a URL and token
-            if repo_url and not errors:
-                parsed = parse_github_url(repo_url)
-                if parsed:
-                    owner, repo = parsed
-                    validation = await validate_repo_access(token, owner, repo)
-                    if not validation.valid:
-                        if validation.error == GitHubError.REPO_NOT_FOUND:
-                            errors[CONF_REPO] = "repo_not_found"
-                        elif validation.error == GitHubError.INVALID_TOKEN:
-                            errors[CONF_TOKEN] = "invalid_token"
-                        elif validation.error == GitHubError.INSUFFICIENT_PERMISSIONS:
-                            errors[CONF_TOKEN] = "insufficient_permissions"
-                        elif validation.error == GitHubError.RATE_LIMITED:
-                            errors["base"] = "rate_limited"
-                        else:
-                            errors["base"] = "validation_failed"
-
-                        if validation.error_message:
-                            description_placeholders["error_detail"] = (
-                                validation.error_message
-                            )
-                            _LOGGER.warning(
-                                "Repository validation failed: %s",
-                                validation.error_message,
-                            )
-
-            if not errors:
-                unique_id = _generate_unique_id(repo_url, slug)
-                await self.async_set_unique_id(unique_id)
+            (
+                repo,
+                errors,
+                description_placeholders,
+            ) = await self._async_validate_manual(user_input)
+            if repo is not None:
+                await self.async_set_unique_id(_generate_unique_id(repo[CONF_SLUG]))
                 self._abort_if_unique_id_configured()
 
                 return self.async_create_entry(
-                    title=slug,
+                    title=repo[CONF_SLUG],
                     data={
-                        CONF_REPO: repo_url,
-                        CONF_SLUG: slug,
-                        CONF_BRANCH: branch or DEFAULT_BRANCH,
-                        CONF_TOKEN: token,
+                        CONF_REPO: repo[CONF_REPO],
+                        CONF_SLUG: repo[CONF_SLUG],
+                        CONF_BRANCH: repo[CONF_BRANCH],
+                        CONF_TOKEN: repo[CONF_TOKEN],
                     },
                     options={
-                        CONF_POLL_INTERVAL: poll_interval,
-                        CONF_BRANCH: branch or DEFAULT_BRANCH,
-                        CONF_TOKEN: token,
+                        CONF_POLL_INTERVAL: repo[CONF_POLL_INTERVAL],
+                        CONF_BRANCH: repo[CONF_BRANCH],
+                        CONF_TOKEN: repo[CONF_TOKEN],
                     },
                 )
 
         # Pre-fill token if we have one
-        default_token = self._token if self._token else ""
-
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_REPO): str,
-                vol.Optional(CONF_SLUG, default=""): str,
-                vol.Optional(CONF_BRANCH, default=DEFAULT_BRANCH): str,
-                vol.Optional(CONF_TOKEN, default=default_token): str,
-                vol.Optional(
-                    CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
-            }
-        )
         return self.async_show_form(
             step_id="manual",
-            data_schema=schema,
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_MANUAL_DATA_SCHEMA, {CONF_TOKEN: self._token}
+            ),
             errors=errors,
             description_placeholders=description_placeholders,
         )
 
+    async def _async_validate_manual(
+        self, user_input: dict[str, Any]
+    ) -> tuple[dict[str, Any] | None, dict[str, str], dict[str, str]]:
+        """Validate the manual step's input.
+
+        Returns the repository settings to store, or None if there are
+        errors, along with the form errors and description placeholders.
+        """
+        errors: dict[str, str] = {}
+        description_placeholders: dict[str, str] = {}
+
+        repo_url, slug, branch, token = _strip_manual_fields(
+            user_input, {CONF_BRANCH: DEFAULT_BRANCH, CONF_TOKEN: self._token}
+        )
+
+        if not repo_url:
+            errors[CONF_REPO] = "required"
+        elif not repo_url.startswith("https://"):
+            errors[CONF_REPO] = "invalid_url"
+
+        parsed = parse_github_url(repo_url)
+        if not slug:
+            # Try to extract slug from URL
+            if parsed:
+                slug = parsed[1]
+            else:
+                errors[CONF_SLUG] = "required"
+
+        if errors:
+            return None, errors, description_placeholders
+
+        # Validate repository access for GitHub URLs
+        if parsed:
+            owner, repo = parsed
+            validation = await validate_repo_access(
+                async_get_clientsession(self.hass), token, owner, repo
+            )
+            if not validation.valid:
+                field, error = _REPO_ERRORS.get(validation.error, _REPO_ERROR_DEFAULT)
+                errors[field] = error
+
+                if validation.error_message:
+                    description_placeholders["error_detail"] = validation.error_message
+                    _LOGGER.warning(
+                        "Repository validation failed: %s",
+                        validation.error_message,
+                    )
+                return None, errors, description_placeholders
+
+        return (
+            {
+                CONF_REPO: repo_url,
+                CONF_SLUG: slug,
+                CONF_BRANCH: branch or DEFAULT_BRANCH,
+                CONF_TOKEN: token,
+                CONF_POLL_INTERVAL: user_input.get(
+                    CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
+                ),
+            },
+            errors,
+            description_placeholders,
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a repository carried over from a version 1 entry.
+
+        The repository was already syncing under the old entry, so it is
+        imported as-is without validating access again.
+        """
+        repo_url = import_data[CONF_REPO]
+        slug = import_data.get(CONF_SLUG)
+        if not slug:
+            # Same fallback the loader uses: the last path segment of the URL
+            slug = repo_url.rstrip("/").split("/")[-1].removesuffix(".git")
+        branch = import_data.get(CONF_BRANCH) or DEFAULT_BRANCH
+        token = import_data.get(CONF_TOKEN, "")
+
+        await self.async_set_unique_id(_generate_unique_id(slug))
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=slug,
+            data={
+                CONF_REPO: repo_url,
+                CONF_SLUG: slug,
+                CONF_BRANCH: branch,
+                CONF_TOKEN: token,
+            },
+            options={
+                CONF_POLL_INTERVAL: DEFAULT_POLL_INTERVAL,
+                CONF_BRANCH: branch,
+                CONF_TOKEN: token,
+            },
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -313,37 +486,37 @@ class OptionsFlow(config_entries.OptionsFlow):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            branch = user_input.get(CONF_BRANCH, DEFAULT_BRANCH).strip()
-            token = user_input.get(CONF_TOKEN, "").strip()
-            poll_interval = user_input.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
-
+            # A token entered here is checked with GitHub again next time,
+            # even if it was rejected before
+            if user_input[CONF_TOKEN]:
+                invalidate_token_cache(user_input[CONF_TOKEN])
+
+            # OPTIONS_SCHEMA has already stripped the text and filled in
+            # defaults; only a branch left blank needs replacing. Options
+            # not on this form are carried over unchanged.
             return self.async_create_entry(
                 title="",
                 data={
-                    CONF_BRANCH: branch or DEFAULT_BRANCH,
-                    CONF_TOKEN: token,
-                    CONF_POLL_INTERVAL: poll_interval,
+                    **self._entry.options,
+                    **user_input,
+                    CONF_BRANCH: user_input[CONF_BRANCH] or DEFAULT_BRANCH,
                 },
             )
 
-        # Get current values
-        current_branch = self._entry.options.get(
-            CONF_BRANCH, self._entry.data.get(CONF_BRANCH, DEFAULT_BRANCH)
-        )
-        current_token = self._entry.options.get(
-            CONF_TOKEN, self._entry.data.get(CONF_TOKEN, "")
-        )
-        current_poll_interval = self._entry.options.get(
-            CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
-        )
+        # Get current values, falling back to what the entry was created with
+        options = self._entry.options
+        data = self._entry.data
+        current = {
+            CONF_BRANCH: options.get(
+                CONF_BRANCH, data.get(CONF_BRANCH, DEFAULT_BRANCH)
+            ),
+            CONF_TOKEN: options.get(CONF_TOKEN, data.get(CONF_TOKEN, "")),
+            CONF_POLL_INTERVAL: options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+            CONF_FULL_HISTORY: options.get(CONF_FULL_HISTORY, False),
+        }
 
-        schema = vol.Schema(
-            {
-                vol.Optional(CONF_BRANCH, default=current_branch): str,
-                vol.Optional(CONF_TOKEN, default=current_token): str,
-                vol.Optional(
-                    CONF_POLL_INTERVAL, default=current_poll_interval
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
-            }
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(OPTIONS_SCHEMA, current),
+            errors=errors,
         )
-        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
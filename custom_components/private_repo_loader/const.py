@@ -10,8 +10,12 @@ CONF_REPO: Final = "repository"
 CONF_BRANCH: Final = "branch"
 CONF_SLUG: Final = "slug"
 CONF_POLL_INTERVAL: Final = "poll_interval"
+CONF_FULL_HISTORY: Final = "full_history"  # Keep git history instead of a shallow clone
 CONF_LAST_CHANGED: Final = "last_changed"
 CONF_LAST_CHECKED: Final = "last_checked"
+CONF_REPOS: Final = "repos"  # Version 1 entries only: list of repositories in options
+CONF_REMOTE_HEAD: Final = "remote_head"  # [ETag, SHA] of the last branch lookup
+CONF_LAST_COMMIT: Final = "last_commit"  # SHA of the last synced commit
 
 DEFAULT_BRANCH: Final = "main"
 
@@ -26,6 +30,20 @@ THRESHOLD_1_DAY: Final = 24 * 60 * 60  # 1 day
 THRESHOLD_1_WEEK: Final = 7 * 24 * 60 * 60  # 1 week
 THRESHOLD_1_MONTH: Final = 30 * 24 * 60 * 60  # 1 month
 
+# Git syncs run on a dedicated thread pool shared by all repository entries
+SYNC_MAX_WORKERS: Final = 8
+
+# A git command still running after this many seconds is stopped, so a
+# stalled fetch cannot hold a sync thread and the repository's lock forever
+GIT_COMMAND_TIMEOUT: Final = 600
+
+# First syncs after startup are spread over this many seconds
+STARTUP_STAGGER_MAX: Final = 60
+
+# Keys in hass.data[DOMAIN]
+DATA_EXECUTOR: Final = "executor"
+DATA_COORDINATORS: Final = "coordinators"  # entry_id -> loaded coordinator
+
 SERVICE_SYNC_NOW: Final = "sync_now"
 SERVICE_RELOAD_REPOS: Final = "reload_repos"
 DISPATCHER_SYNC_DONE: Final = f"{DOMAIN}_sync_done"
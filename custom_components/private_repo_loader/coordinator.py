@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
@@ -18,7 +24,10 @@ from .const import (
     CONF_BRANCH,
     CONF_TOKEN,
     CONF_POLL_INTERVAL,
+    CONF_FULL_HISTORY,
     CONF_LAST_CHANGED,
+    CONF_LAST_COMMIT,
+    CONF_REMOTE_HEAD,
     DEFAULT_POLL_INTERVAL,
     POLL_INTERVAL_1_DAY,
     POLL_INTERVAL_1_WEEK,
@@ -26,7 +35,11 @@ from .const import (
     THRESHOLD_1_DAY,
     THRESHOLD_1_WEEK,
     THRESHOLD_1_MONTH,
+    SYNC_MAX_WORKERS,
+    STARTUP_STAGGER_MAX,
+    DATA_EXECUTOR,
 )
+from .github_api import GitHubError, get_branch_head, parse_github_url
 from .loader import sync_repo_detailed, SyncResult
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,8 +60,11 @@ def calculate_poll_interval(
     if last_changed is None:
         return base_interval
 
-    now = datetime.now()
-    time_since_change = (now - last_changed).total_seconds()
+    # Timestamps stored by older versions are naive local time
+    if last_changed.tzinfo is None:
+        last_changed = last_changed.astimezone()
+
+    time_since_change = (dt_util.utcnow() - last_changed).total_seconds()
 
     if time_since_change >= THRESHOLD_1_MONTH:
         return POLL_INTERVAL_1_MONTH
@@ -60,6 +76,44 @@ def calculate_poll_interval(
         return base_interval
 
 
+def calculate_startup_delay(repo_url: str, max_delay: int = STARTUP_STAGGER_MAX) -> int:
+    """Return how many seconds to wait before a repository's first sync.
+
+    Spreads the first syncs of many repositories over max_delay seconds
+    instead of starting them all at once. Since polls follow on from the
+    first sync, they stay out of step afterwards too. The offset comes from
+    the URL so a repository keeps the same slot across restarts.
+    """
+    return zlib.crc32(repo_url.encode()) % max_delay
+
+
+@callback
+def async_get_sync_executor(hass: HomeAssistant) -> ThreadPoolExecutor:
+    """Return the thread pool used for git syncs, creating it on first use.
+
+    Git work runs here instead of Home Assistant's shared executor so that a
+    batch of slow clones cannot starve unrelated I/O. Worker threads are only
+    started as jobs arrive, so the pool never holds more threads than there
+    are repositories syncing at once (capped at SYNC_MAX_WORKERS).
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executor = domain_data.get(DATA_EXECUTOR)
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=SYNC_MAX_WORKERS, thread_name_prefix="prl_sync"
+        )
+        domain_data[DATA_EXECUTOR] = executor
+    return executor
+
+
+@callback
+def async_shutdown_sync_executor(hass: HomeAssistant) -> None:
+    """Shut down the git sync thread pool if one was created."""
+    executor = hass.data.get(DOMAIN, {}).pop(DATA_EXECUTOR, None)
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
 class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator for a single private repository with sliding scale polling."""
 
@@ -69,11 +123,27 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
+        defer_polling: bool = False,
     ) -> None:
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        With defer_polling set, nothing is polled until async_first_sync has
+        run. Entities start the poll timer as soon as they subscribe, which
+        would otherwise run git while Home Assistant is still starting.
+        """
         self.entry = entry
+        # Options this coordinator was built with, to tell option changes
+        # apart from the coordinator's own entry.data writes
+        self.loaded_options = dict(entry.options)
         self._last_changed: datetime | None = None
-        self._last_commit_sha: str | None = None
+        self._last_commit_sha: str | None = entry.data.get(CONF_LAST_COMMIT)
+        # (ETag, SHA) of the last branch head lookup against the GitHub API
+        self._remote_head: tuple[str, str] | None = None
+        # Serializes syncs; _sync_count numbers each run so overlapping
+        # requests can share a run instead of queuing another one
+        self._sync_lock = asyncio.Lock()
+        self._sync_count = 0
+        self._last_sync_data: dict[str, Any] | None = None
         self._base_poll_interval = entry.options.get(
             CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
         )
@@ -86,16 +156,25 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             except (ValueError, TypeError):
                 self._last_changed = None
 
+        # Restore the last branch lookup so the first lookup after a restart
+        # can be answered with a 304 and, with the last synced commit, skip git
+        stored_remote_head = entry.data.get(CONF_REMOTE_HEAD)
+        if isinstance(stored_remote_head, list) and len(stored_remote_head) == 2:
+            self._remote_head = (stored_remote_head[0], stored_remote_head[1])
+
         # Calculate initial update interval
         initial_interval = calculate_poll_interval(
             self._last_changed, self._base_poll_interval
         )
+        self._poll_interval = initial_interval
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{entry.data.get(CONF_SLUG, 'unknown')}",
-            update_interval=timedelta(minutes=initial_interval),
+            update_interval=(
+                None if defer_polling else timedelta(minutes=initial_interval)
+            ),
             config_entry=entry,
         )
 
@@ -123,14 +202,50 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     @property
     def current_poll_interval(self) -> int:
         """Return the current poll interval in minutes."""
-        return int(self.update_interval.total_seconds() / 60)
+        return self._poll_interval
 
+    @cached_property
     def _dest_root(self) -> Path:
-        """Return path to the custom_components folder."""
+        """Return path to the custom_components folder.
+
+        The config directory is fixed for the life of the instance, so the
+        path is built once rather than on every poll.
+        """
         return Path(self.hass.config.path("custom_components"))
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the repository."""
+        return await self._async_sync()
+
+    async def _async_sync(self, force: bool = False) -> dict[str, Any]:
+        """Sync the repository, coalescing overlapping requests.
+
+        Only one sync runs at a time since they share a working tree. A poll
+        arriving while a sync is running reuses that sync's result. A forced
+        sync must see the remote as it is now, so it reuses a result only if
+        the run started after it was requested, which lets a burst of forced
+        requests share a single follow-up run.
+        """
+        requested = self._sync_count
+        reusable = (
+            requested if self._sync_lock.locked() and not force else requested + 1
+        )
+
+        async with self._sync_lock:
+            if self._sync_count >= reusable and self._last_sync_data is not None:
+                return self._last_sync_data
+
+            self._sync_count += 1
+            self._last_sync_data = None
+            self._last_sync_data = await self._async_run_sync(force)
+            return self._last_sync_data
+
+    async def _async_run_sync(self, force: bool) -> dict[str, Any]:
+        """Sync the repository, skipping git when the remote is unchanged.
+
+        With force set, git always runs, even if the branch head lookup says
+        nothing has changed.
+        """
         cfg = {
             CONF_REPO: self.entry.data.get(CONF_REPO, ""),
             CONF_SLUG: self.entry.data.get(CONF_SLUG, ""),
@@ -140,18 +255,21 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             CONF_TOKEN: self.entry.options.get(
                 CONF_TOKEN, self.entry.data.get(CONF_TOKEN, "")
             ),
+            CONF_FULL_HISTORY: self.entry.options.get(CONF_FULL_HISTORY, False),
         }
 
-        root = self._dest_root()
+        root = self._dest_root
 
-        try:
-            result: SyncResult = await self.hass.async_add_executor_job(
-                sync_repo_detailed, root, cfg
-            )
-        except Exception as exc:
-            raise UpdateFailed(f"Error syncing repo: {exc}") from exc
+        result = None if force else await self._async_check_remote_head(cfg)
+        if result is None:
+            try:
+                result = await self.hass.loop.run_in_executor(
+                    async_get_sync_executor(self.hass), sync_repo_detailed, root, cfg
+                )
+            except Exception as exc:
+                raise UpdateFailed(f"Error syncing repo: {exc}") from exc
 
-        now = datetime.now()
+        now = dt_util.utcnow()
         data = {
             "status": result.status,
             "has_changes": result.has_changes,
@@ -161,17 +279,26 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "error": result.error,
         }
 
-        # Update last_changed if there were changes
-        if result.has_changes:
-            self._last_changed = now
+        if result.commit_sha:
             self._last_commit_sha = result.commit_sha
-            data["last_changed"] = now.isoformat()
 
-            # Store last_changed in config entry data
-            new_data = dict(self.entry.data)
+        # Store what the next run, possibly after a restart, needs to skip git;
+        # the entry is only written when something has actually changed
+        new_data = dict(self.entry.data)
+        if result.has_changes:
             new_data[CONF_LAST_CHANGED] = now.isoformat()
+        if self._last_commit_sha:
+            new_data[CONF_LAST_COMMIT] = self._last_commit_sha
+        if self._remote_head:
+            new_data[CONF_REMOTE_HEAD] = list(self._remote_head)
+        if new_data != self.entry.data:
             self.hass.config_entries.async_update_entry(self.entry, data=new_data)
 
+        # Update last_changed if there were changes
+        if result.has_changes:
+            self._last_changed = now
+            data["last_changed"] = now.isoformat()
+
             _LOGGER.info(
                 "Repository %s has changes, resetting poll interval to %d minutes",
                 self.repo_slug,
@@ -185,8 +312,11 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._last_changed, self._base_poll_interval
         )
 
-        if new_interval != self.current_poll_interval:
-            self.update_interval = timedelta(minutes=new_interval)
+        if new_interval != self._poll_interval:
+            self._poll_interval = new_interval
+            # Deferred polling is started by async_first_sync
+            if self.update_interval is not None:
+                self.update_interval = timedelta(minutes=new_interval)
             _LOGGER.debug(
                 "Repository %s poll interval changed to %d minutes",
                 self.repo_slug,
@@ -195,6 +325,62 @@ class PrivateRepoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         return data
 
+    async def _async_check_remote_head(self, cfg: dict[str, Any]) -> SyncResult | None:
+        """Return an unchanged result if the remote branch has not moved.
+
+        Idle repositories are the common case, so before running git the
+        branch head is looked up through the GitHub API using Home Assistant's
+        shared HTTP session. Returns None when git has to run: nothing has been
+        synced yet, the URL is not a GitHub URL, the lookup failed, or the
+        branch points at a new commit.
+        """
+        if self._last_commit_sha is None:
+            return None
+
+        parsed = parse_github_url(cfg[CONF_REPO])
+        if parsed is None:
+            return None
+        owner, repo = parsed
+
+        cached_etag, cached_sha = self._remote_head or (None, None)
+        head = await get_branch_head(
+            async_get_clientsession(self.hass),
+            cfg[CONF_TOKEN],
+            owner,
+            repo,
+            cfg[CONF_BRANCH],
+            cached_etag,
+        )
+        if head.error is not GitHubError.NONE:
+            return None
+
+        if head.not_modified:
+            remote_sha = cached_sha
+        else:
+            remote_sha = head.sha
+            if head.etag and head.sha:
+                self._remote_head = (head.etag, head.sha)
+
+        if remote_sha != self._last_commit_sha:
+            return None
+
+        return SyncResult(status="unchanged", commit_sha=remote_sha)
+
+    async def async_first_sync(self) -> None:
+        """Run the first sync of a coordinator created with defer_polling.
+
+        Polling starts when this sync finishes, so each repository keeps the
+        offset its first sync was started at.
+        """
+        self.update_interval = timedelta(minutes=self._poll_interval)
+        await self.async_refresh()
+
     async def async_force_sync(self) -> dict[str, Any]:
-        """Force an immediate sync of the repository."""
-        return await self._async_update_data()
+        """Force an immediate sync of the repository.
+
+        The result is published to entities as soon as this repository is
+        done, without waiting for other repositories synced alongside it.
+        """
+        data = await self._async_sync(force=True)
+        self.async_set_updated_data(data)
+        return data
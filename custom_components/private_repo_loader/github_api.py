@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 import aiohttp
@@ -13,6 +20,41 @@ _LOGGER = logging.getLogger(__name__)
 
 GITHUB_API_BASE = "https://api.github.com"
 
+# Branch head lookups run on every poll, so keep them from hanging a refresh
+BRANCH_HEAD_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# The parts of JSON responses that callers read are kept with their ETag,
+# keyed by URL, query and token hash, so a repeated request can be answered
+# with a 304. GitHub does not count those against the primary rate limit.
+# The raw bodies are not kept: a page of 100 repositories carries far more
+# than the listing uses.
+RESPONSE_CACHE_MAX_AGE = 1800
+RESPONSE_CACHE_SIZE = 256
+_response_cache: OrderedDict[tuple[str, str, str], tuple[str, Any, float]] = (
+    OrderedDict()
+)
+
+# Tokens GitHub rejected with a 401, by token hash, so a revoked token is
+# not sent again on every retry. Other failures are not cached: rate limits
+# lift, and permissions can be granted without issuing a new token.
+BAD_TOKEN_CACHE_TTL = 3600
+_bad_token_cache: dict[str, tuple[GitHubValidationResult, float]] = {}
+
+# Fields of a repository object that callers read
+_REPO_FIELDS = (
+    "full_name",
+    "name",
+    "private",
+    "html_url",
+    "clone_url",
+    "default_branch",
+    "description",
+)
+
+# Repository listing is capped at this many pages of 100 repositories
+REPO_LIST_MAX_PAGES = 10
+_LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
 
 class GitHubError(Enum):
     """GitHub API error types."""
@@ -50,7 +92,95 @@ class GitHubRepoInfo:
     description: str | None = None
 
 
-async def validate_token(token: str) -> GitHubValidationResult:
+@dataclass
+class GitHubBranchHead:
+    """Result of looking up the head commit of a branch."""
+
+    sha: str | None = None
+    etag: str | None = None
+    not_modified: bool = False  # True on a 304 for the supplied ETag
+    error: GitHubError = GitHubError.NONE
+
+
+@dataclass(frozen=True)
+class _RepoPage:
+    """One page of a repository listing."""
+
+    repos: tuple[GitHubRepoInfo, ...]
+    last_page: int  # From the Link header, which a 304 need not repeat
+
+
+def _login(headers: Mapping[str, str], data: dict[str, Any]) -> str | None:
+    """Return the login of an authenticated user object."""
+    return data.get("login")
+
+
+def _repo_fields(headers: Mapping[str, str], data: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields of a repository object that callers read."""
+    return {field: data[field] for field in _REPO_FIELDS if field in data}
+
+
+def _repo_page(
+    headers: Mapping[str, str], data: list[dict[str, Any]] | None
+) -> _RepoPage:
+    """Build one page of a repository listing and the listing's page count."""
+    last_page = 1
+    if match := _LAST_PAGE_RE.search(headers.get("Link", "")):
+        last_page = int(match.group(1))
+    return _RepoPage(
+        repos=tuple(
+            GitHubRepoInfo(
+                full_name=repo_data["full_name"],
+                name=repo_data["name"],
+                private=repo_data["private"],
+                html_url=repo_data["html_url"],
+                clone_url=repo_data["clone_url"],
+                default_branch=repo_data.get("default_branch", "main"),
+                description=repo_data.get("description"),
+            )
+            for repo_data in data or ()
+        ),
+        last_page=last_page,
+    )
+
+
+def _token_hash(token: str) -> str:
+    """Return the hash a token is cached under."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _get_rejected_token(token: str) -> GitHubValidationResult | None:
+    """Return the cached result for a token GitHub recently rejected."""
+    key = _token_hash(token)
+    cached = _bad_token_cache.get(key)
+    if cached is None:
+        return None
+    result, stored_at = cached
+    if time.monotonic() - stored_at >= BAD_TOKEN_CACHE_TTL:
+        del _bad_token_cache[key]
+        return None
+    return result
+
+
+def _reject_token(token: str) -> GitHubValidationResult:
+    """Remember that GitHub rejected a token and return the result."""
+    result = GitHubValidationResult(
+        valid=False,
+        error=GitHubError.INVALID_TOKEN,
+        error_message="Invalid or expired token",
+    )
+    _bad_token_cache[_token_hash(token)] = (result, time.monotonic())
+    return result
+
+
+def invalidate_token_cache(token: str) -> None:
+    """Forget a token's cached rejection so it is checked with GitHub again."""
+    _bad_token_cache.pop(_token_hash(token), None)
+
+
+async def validate_token(
+    session: aiohttp.ClientSession, token: str
+) -> GitHubValidationResult:
     """Validate a GitHub Personal Access Token.
 
     Returns information about the token validity and the authenticated user.
@@ -61,6 +191,8 @@ async def validate_token(token: str) -> GitHubValidationResult:
             error=GitHubError.INVALID_TOKEN,
             error_message="Token is empty",
         )
+    if rejected := _get_rejected_token(token):
+        return rejected
 
     headers = {
         "Authorization": f"token {token}",
@@ -69,42 +201,13 @@ async def validate_token(token: str) -> GitHubValidationResult:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{GITHUB_API_BASE}/user", headers=headers
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return GitHubValidationResult(
-                        valid=True,
-                        username=data.get("login"),
-                    )
-                elif response.status == 401:
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.INVALID_TOKEN,
-                        error_message="Invalid or expired token",
-                    )
-                elif response.status == 403:
-                    # Check for rate limiting
-                    remaining = response.headers.get("X-RateLimit-Remaining", "0")
-                    if remaining == "0":
-                        return GitHubValidationResult(
-                            valid=False,
-                            error=GitHubError.RATE_LIMITED,
-                            error_message="GitHub API rate limit exceeded",
-                        )
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.INSUFFICIENT_PERMISSIONS,
-                        error_message="Token has insufficient permissions",
-                    )
-                else:
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.UNKNOWN,
-                        error_message=f"Unexpected response: {response.status}",
-                    )
+        status, response_headers, username = await _get_json(
+            session,
+            f"{GITHUB_API_BASE}/user",
+            token,
+            headers,
+            _login,
+        )
     except aiohttp.ClientError as exc:
         _LOGGER.error("Network error validating token: %s", exc)
         return GitHubValidationResult(
@@ -113,14 +216,45 @@ async def validate_token(token: str) -> GitHubValidationResult:
             error_message=str(exc),
         )
 
+    if status == 200:
+        return GitHubValidationResult(
+            valid=True,
+            username=username,
+        )
+    elif status == 401:
+        return _reject_token(token)
+    elif status == 403:
+        # Check for rate limiting
+        remaining = response_headers.get("X-RateLimit-Remaining", "0")
+        if remaining == "0":
+            return GitHubValidationResult(
+                valid=False,
+                error=GitHubError.RATE_LIMITED,
+                error_message="GitHub API rate limit exceeded",
+            )
+        return GitHubValidationResult(
+            valid=False,
+            error=GitHubError.INSUFFICIENT_PERMISSIONS,
+            error_message="Token has insufficient permissions",
+        )
+    else:
+        return GitHubValidationResult(
+            valid=False,
+            error=GitHubError.UNKNOWN,
+            error_message=f"Unexpected response: {status}",
+        )
+
 
 async def validate_repo_access(
-    token: str, owner: str, repo: str
+    session: aiohttp.ClientSession, token: str, owner: str, repo: str
 ) -> GitHubValidationResult:
     """Validate access to a specific repository.
 
     Returns detailed information about whether the token can access the repo.
     """
+    if token and (rejected := _get_rejected_token(token)):
+        return rejected
+
     headers = {
         "Accept": "application/vnd.github.v3+json",
         "User-Agent": "PrivateRepoLoader-HomeAssistant",
@@ -129,63 +263,13 @@ async def validate_repo_access(
         headers["Authorization"] = f"token {token}"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{GITHUB_API_BASE}/repos/{owner}/{repo}", headers=headers
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return GitHubValidationResult(
-                        valid=True,
-                        repo_info=data,
-                    )
-                elif response.status == 401:
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.INVALID_TOKEN,
-                        error_message="Invalid or expired token",
-                    )
-                elif response.status == 403:
-                    remaining = response.headers.get("X-RateLimit-Remaining", "0")
-                    if remaining == "0":
-                        return GitHubValidationResult(
-                            valid=False,
-                            error=GitHubError.RATE_LIMITED,
-                            error_message="GitHub API rate limit exceeded",
-                        )
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.INSUFFICIENT_PERMISSIONS,
-                        error_message=(
-                            f"Token does not have access to {owner}/{repo}. "
-                            "Ensure your PAT has 'repo' scope for private repositories."
-                        ),
-                    )
-                elif response.status == 404:
-                    # Could be repo doesn't exist OR no access
-                    if token:
-                        return GitHubValidationResult(
-                            valid=False,
-                            error=GitHubError.REPO_NOT_FOUND,
-                            error_message=(
-                                f"Repository {owner}/{repo} not found or token lacks access. "
-                                "For private repos, ensure PAT has 'repo' scope."
-                            ),
-                        )
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.REPO_NOT_FOUND,
-                        error_message=(
-                            f"Repository {owner}/{repo} not found. "
-                            "For private repos, you must provide a PAT."
-                        ),
-                    )
-                else:
-                    return GitHubValidationResult(
-                        valid=False,
-                        error=GitHubError.UNKNOWN,
-                        error_message=f"Unexpected response: {response.status}",
-                    )
+        status, response_headers, data = await _get_json(
+            session,
+            f"{GITHUB_API_BASE}/repos/{owner}/{repo}",
+            token,
+            headers,
+            _repo_fields,
+        )
     except aiohttp.ClientError as exc:
         _LOGGER.error("Network error accessing repo %s/%s: %s", owner, repo, exc)
         return GitHubValidationResult(
@@ -194,9 +278,58 @@ async def validate_repo_access(
             error_message=str(exc),
         )
 
+    if status == 200:
+        return GitHubValidationResult(
+            valid=True,
+            repo_info=data,
+        )
+    elif status == 401:
+        return _reject_token(token)
+    elif status == 403:
+        remaining = response_headers.get("X-RateLimit-Remaining", "0")
+        if remaining == "0":
+            return GitHubValidationResult(
+                valid=False,
+                error=GitHubError.RATE_LIMITED,
+                error_message="GitHub API rate limit exceeded",
+            )
+        return GitHubValidationResult(
+            valid=False,
+            error=GitHubError.INSUFFICIENT_PERMISSIONS,
+            error_message=(
+                f"Token does not have access to {owner}/{repo}. "
+                "Ensure your PAT has 'repo' scope for private repositories."
+            ),
+        )
+    elif status == 404:
+        # Could be repo doesn't exist OR no access
+        if token:
+            return GitHubValidationResult(
+                valid=False,
+                error=GitHubError.REPO_NOT_FOUND,
+                error_message=(
+                    f"Repository {owner}/{repo} not found or token lacks access. "
+                    "For private repos, ensure PAT has 'repo' scope."
+                ),
+            )
+        return GitHubValidationResult(
+            valid=False,
+            error=GitHubError.REPO_NOT_FOUND,
+            error_message=(
+                f"Repository {owner}/{repo} not found. "
+                "For private repos, you must provide a PAT."
+            ),
+        )
+    else:
+        return GitHubValidationResult(
+            valid=False,
+            error=GitHubError.UNKNOWN,
+            error_message=f"Unexpected response: {status}",
+        )
+
 
 async def list_user_repos(
-    token: str, include_private: bool = True
+    session: aiohttp.ClientSession, token: str, include_private: bool = True
 ) -> list[GitHubRepoInfo]:
     """List repositories accessible to the authenticated user.
 
@@ -211,58 +344,61 @@ async def list_user_repos(
         "User-Agent": "PrivateRepoLoader-HomeAssistant",
     }
 
+    params = {
+        "visibility": "all" if include_private else "public",
+        "per_page": "100",
+        "sort": "updated",
+        "direction": "desc",
+    }
+
+    async def _fetch_page(page: int) -> tuple[int, Mapping[str, str], Any]:
+        return await _get_json(
+            session,
+            f"{GITHUB_API_BASE}/user/repos",
+            token,
+            headers,
+            _repo_page,
+            {**params, "page": str(page)},
+        )
+
     repos: list[GitHubRepoInfo] = []
-    page = 1
-    per_page = 100
 
     try:
-        async with aiohttp.ClientSession() as session:
-            while True:
-                params = {
-                    "visibility": "all" if include_private else "public",
-                    "per_page": str(per_page),
-                    "page": str(page),
-                    "sort": "updated",
-                    "direction": "desc",
-                }
-                async with session.get(
-                    f"{GITHUB_API_BASE}/user/repos",
-                    headers=headers,
-                    params=params,
-                ) as response:
-                    if response.status != 200:
-                        _LOGGER.warning(
-                            "Failed to fetch repos page %d: %s",
-                            page,
-                            response.status,
-                        )
-                        break
-
-                    data = await response.json()
-                    if not data:
-                        break
-
-                    for repo_data in data:
-                        repos.append(
-                            GitHubRepoInfo(
-                                full_name=repo_data["full_name"],
-                                name=repo_data["name"],
-                                private=repo_data["private"],
-                                html_url=repo_data["html_url"],
-                                clone_url=repo_data["clone_url"],
-                                default_branch=repo_data.get("default_branch", "main"),
-                                description=repo_data.get("description"),
-                            )
-                        )
-
-                    if len(data) < per_page:
-                        break
-                    page += 1
-
-                    # Safety limit to prevent infinite loops
-                    if page > 10:
-                        _LOGGER.warning("Reached maximum page limit for repo listing")
-                        break
+        # The first page says how many pages there are, so the rest can be
+        # requested at once instead of one after another
+        first = await _fetch_page(1)
+        last_page = first[2].last_page if first[2] else 1
+        if last_page > REPO_LIST_MAX_PAGES:
+            _LOGGER.warning("Reached maximum page limit for repo listing")
+            last_page = REPO_LIST_MAX_PAGES
+
+        # A failed page is skipped, keeping the pages that did load
+        pages: list[tuple[int, Mapping[str, str], Any] | BaseException] = [first]
+        if last_page > 1:
+            pages += await asyncio.gather(
+                *(_fetch_page(page) for page in range(2, last_page + 1)),
+                return_exceptions=True,
+            )
+
+        # Pages come back in order, and GitHub sorts across pages, so the
+        # list stays most recently updated first
+        for page, response in enumerate(pages, start=1):
+            if isinstance(response, BaseException):
+                if not isinstance(response, aiohttp.ClientError):
+                    raise response
+                _LOGGER.error("Network error listing repos page %d: %s", page, response)
+                continue
+
+            status, _, repo_page = response
+            if status != 200:
+                _LOGGER.warning(
+                    "Failed to fetch repos page %d: %s",
+                    page,
+                    status,
+                )
+                continue
+
+            repos.extend(repo_page.repos)
 
     except aiohttp.ClientError as exc:
         _LOGGER.error("Network error listing repos: %s", exc)
@@ -270,6 +406,104 @@ async def list_user_repos(
     return repos
 
 
+async def _get_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    token: str,
+    headers: dict[str, str],
+    parse: Callable[[Mapping[str, str], Any], Any],
+    params: dict[str, str] | None = None,
+) -> tuple[int, Mapping[str, str], Any]:
+    """GET a JSON resource, revalidating a cached copy with If-None-Match.
+
+    parse turns the response headers and decoded body into what the caller
+    reads, and only that is cached, so a 304 is answered with what the
+    original response said. Returns the status, the response headers and
+    the parsed result. A 304 for a cached response is returned as a 200 with
+    the cached result; for any other status besides 200 the result is None.
+    """
+    key = (
+        url,
+        "&".join(f"{name}={value}" for name, value in sorted((params or {}).items())),
+        _token_hash(token),
+    )
+    now = time.monotonic()
+    cached = _response_cache.get(key)
+    if cached is not None and now - cached[2] >= RESPONSE_CACHE_MAX_AGE:
+        del _response_cache[key]
+        cached = None
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    async with session.get(url, headers=headers, params=params) as response:
+        if response.status == 304 and cached is not None:
+            _response_cache[key] = (cached[0], cached[1], now)
+            _response_cache.move_to_end(key)
+            return 200, response.headers, cached[1]
+        if response.status != 200:
+            return response.status, response.headers, None
+
+        data = parse(response.headers, await response.json())
+        etag = response.headers.get("ETag")
+        if etag:
+            _response_cache[key] = (etag, data, now)
+            _response_cache.move_to_end(key)
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        return 200, response.headers, data
+
+
+async def get_branch_head(
+    session: aiohttp.ClientSession,
+    token: str,
+    owner: str,
+    repo: str,
+    branch: str,
+    etag: str | None = None,
+) -> GitHubBranchHead:
+    """Look up the commit SHA at the head of a branch.
+
+    Uses the SHA media type so the response body is just the commit hash, and
+    sends If-None-Match when an ETag from a previous lookup is given. A 304
+    answer is reported as not_modified and does not count against the
+    primary rate limit.
+    """
+    headers = {
+        "Accept": "application/vnd.github.sha",
+        "User-Agent": "PrivateRepoLoader-HomeAssistant",
+    }
+    if token:
+        headers["Authorization"] = f"token {token}"
+    if etag:
+        headers["If-None-Match"] = etag
+
+    try:
+        async with session.get(
+            f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/{branch}",
+            headers=headers,
+            timeout=BRANCH_HEAD_TIMEOUT,
+        ) as response:
+            if response.status == 304:
+                return GitHubBranchHead(etag=etag, not_modified=True)
+            if response.status == 200:
+                sha = (await response.text()).strip()
+                return GitHubBranchHead(sha=sha, etag=response.headers.get("ETag"))
+            if response.status == 401:
+                return GitHubBranchHead(error=GitHubError.INVALID_TOKEN)
+            if response.status == 403:
+                remaining = response.headers.get("X-RateLimit-Remaining", "0")
+                if remaining == "0":
+                    return GitHubBranchHead(error=GitHubError.RATE_LIMITED)
+                return GitHubBranchHead(error=GitHubError.INSUFFICIENT_PERMISSIONS)
+            if response.status in (404, 422):
+                return GitHubBranchHead(error=GitHubError.REPO_NOT_FOUND)
+            return GitHubBranchHead(error=GitHubError.UNKNOWN)
+    except (aiohttp.ClientError, TimeoutError) as exc:
+        _LOGGER.debug("Branch head lookup failed for %s/%s: %s", owner, repo, exc)
+        return GitHubBranchHead(error=GitHubError.NETWORK_ERROR)
+
+
+@lru_cache(maxsize=128)
 def parse_github_url(url: str) -> tuple[str, str] | None:
     """Parse a GitHub URL to extract owner and repo name.
 
@@ -278,7 +512,8 @@ def parse_github_url(url: str) -> tuple[str, str] | None:
     - https://github.com/owner/repo.git
     - git@github.com:owner/repo.git
 
-    Returns tuple of (owner, repo) or None if parsing fails.
+    Returns tuple of (owner, repo) or None if parsing fails. Results are
+    cached, since every poll parses the same few repository URLs.
     """
     if not url:
         return None
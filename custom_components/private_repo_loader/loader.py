@@ -2,22 +2,23 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import subprocess
 import time
 from dataclasses import dataclass
 from pathlib import Path
 import logging
 from typing import Any
 
-import git
-from git.exc import GitCommandError, InvalidGitRepositoryError
-
 from .const import (
     CONF_TOKEN,
     CONF_REPO,
     CONF_BRANCH,
     CONF_SLUG,
+    CONF_FULL_HISTORY,
     DEFAULT_BRANCH,
+    GIT_COMMAND_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,6 +45,10 @@ class RepositoryNotFoundError(Exception):
     pass
 
 
+class GitCommandError(Exception):
+    """Exception raised when a git command exits with an error or times out."""
+
+
 @dataclass
 class SyncResult:
     """Result of a sync operation."""
@@ -55,19 +60,132 @@ class SyncResult:
     error_type: str | None = None  # "auth", "permission", "not_found", "network", etc.
 
 
-def _auth_url(url: str, token: str | None) -> str:
+# Never let git block on a credential prompt in a headless process
+_GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0", "GCM_INTERACTIVE": "never"}
+
+# Environment variable the credential helper reads the token from
+_TOKEN_ENV = "PRIVATE_REPO_LOADER_TOKEN"
+
+# Answers git's credential request from the environment. The empty helper
+# first clears any configured helpers so none of them stores the token.
+_CREDENTIAL_ARGS = (
+    "-c",
+    "credential.helper=",
+    "-c",
+    (
+        "credential.helper=!f() { echo username=x-access-token; "
+        f'echo "password=${_TOKEN_ENV}"; }}; f'
+    ),
+)
+
+
+def _run_git(*args: str, cwd: Path | None = None, token: str | None = None) -> str:
+    """Run a git command and return its stripped stdout.
+
+    When a token is given it is handed to git through a credential helper
+    and the subprocess environment, so it never appears in a URL or on disk.
+    Raises GitCommandError with git's stderr when the command fails, or when
+    it runs longer than GIT_COMMAND_TIMEOUT seconds.
+    """
+    env = _GIT_ENV
+    if token:
+        args = (*_CREDENTIAL_ARGS, *args)
+        env = {**_GIT_ENV, _TOKEN_ENV: token}
+
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=GIT_COMMAND_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise GitCommandError(
+            f"git timed out after {GIT_COMMAND_TIMEOUT} seconds"
+        ) from exc
+    if proc.returncode != 0:
+        raise GitCommandError(
+            f"git exited with status {proc.returncode}: {proc.stderr.strip()}"
+        )
+    return proc.stdout.strip()
+
+
+def _remote_url(url: str) -> str:
     if not url.startswith("https://"):
         raise ValueError("Only https clone URLs are supported")
-    return url.replace("https://", f"https://{token}@") if token else url
+    return url
 
 
 def _move_aside(path: Path) -> None:
     shutil.move(str(path), f"{path}.old_{int(time.time())}")
 
 
-def _get_current_commit(repo: git.Repo) -> str:
+def _is_git_repo(path: Path) -> bool:
+    """Return True if path is the top of a git working tree.
+
+    Checked directly rather than with rev-parse, which would also accept a
+    git repository further up, such as a version-controlled config folder.
+    """
+    return (path / ".git").is_dir()
+
+
+def _get_current_commit(repo_path: Path) -> str:
     """Get the current commit SHA."""
-    return repo.head.commit.hexsha
+    return _run_git("rev-parse", "HEAD", cwd=repo_path)
+
+
+def _clone(
+    url: str, path: Path, branch: str, token: str | None, full_history: bool
+) -> None:
+    """Clone a single branch, by default only its tip commit.
+
+    Installing an integration needs the working tree, not its history, so
+    a shallow clone transfers and inflates far fewer objects. full_history
+    keeps the branch history for users who want git log or bisect.
+    """
+    depth = () if full_history else ("--depth=1",)
+    _run_git(
+        "clone",
+        *depth,
+        "--single-branch",
+        "--no-tags",
+        f"--branch={branch}",
+        "--",
+        url,
+        str(path),
+        token=token,
+    )
+
+
+def _fetch(repo_path: Path, branch: str, token: str | None, full_history: bool) -> None:
+    """Fetch a branch and check out its tip over the working tree.
+
+    A shallow fetch skips ref negotiation because a depth-1 fetch has no
+    shared history worth negotiating. With full_history, a clone that is
+    still shallow is deepened once. An explicit refspec is used so a branch
+    other than the one originally cloned can still be fetched.
+    """
+    if not full_history:
+        options = ("-c", "fetch.negotiationAlgorithm=skipping")
+        depth = ("--depth=1",)
+    else:
+        options = ()
+        depth = ("--unshallow",) if (repo_path / ".git" / "shallow").exists() else ()
+
+    _run_git(
+        *options,
+        "fetch",
+        *depth,
+        "--no-tags",
+        "origin",
+        f"+refs/heads/{branch}:refs/remotes/origin/{branch}",
+        cwd=repo_path,
+        token=token,
+    )
+    _run_git("checkout", "--force", "-B", branch, f"origin/{branch}", cwd=repo_path)
 
 
 def _parse_git_error(error_str: str) -> tuple[str, str]:
@@ -110,6 +228,7 @@ def _parse_git_error(error_str: str) -> tuple[str, str]:
         "could not read from remote" in error_lower
         or "remote hung up" in error_lower
         or "connection refused" in error_lower
+        or "timed out" in error_lower
     ):
         return (
             "network",
@@ -171,9 +290,7 @@ def _find_integration_in_repo(repo_path: Path, slug: str) -> Path | None:
             return integrations[0]
 
     # Case 3: Flat structure - integration at root of repo
-    if (repo_path / "manifest.json").exists() and (
-        repo_path / "__init__.py"
-    ).exists():
+    if (repo_path / "manifest.json").exists() and (repo_path / "__init__.py").exists():
         return repo_path
 
     return None
@@ -298,6 +415,7 @@ def sync_repo_detailed(root: Path, cfg: dict[str, Any]) -> SyncResult:
 
     branch = cfg.get(CONF_BRANCH, DEFAULT_BRANCH)
     token = cfg.get(CONF_TOKEN, "")
+    full_history = cfg.get(CONF_FULL_HISTORY, False)
 
     # Get staging path for the repository clone
     # The staging area is at the same level as custom_components
@@ -305,7 +423,7 @@ def sync_repo_detailed(root: Path, cfg: dict[str, Any]) -> SyncResult:
     staging_path = _get_staging_path(config_root, slug)
 
     try:
-        auth = _auth_url(url, token)
+        remote_url = _remote_url(url)
     except ValueError as exc:
         _LOGGER.error("Invalid repository URL: %s", exc)
         return SyncResult(
@@ -317,37 +435,27 @@ def sync_repo_detailed(root: Path, cfg: dict[str, Any]) -> SyncResult:
     try:
         is_new_clone = False
 
-        if staging_path.exists():
-            try:
-                repo = git.Repo(staging_path)
-            except InvalidGitRepositoryError:
+        if staging_path.exists() and _is_git_repo(staging_path):
+            # Get commit before fetch
+            commit_before = _get_current_commit(staging_path)
+
+            # Only rewrite .git/config when the URL actually changed. This
+            # also strips tokens that older versions embedded in the URL.
+            current_url = _run_git("remote", "get-url", "origin", cwd=staging_path)
+            if current_url != remote_url:
+                _run_git("remote", "set-url", "origin", remote_url, cwd=staging_path)
+            _fetch(staging_path, branch, token, full_history)
+
+            # Check if commit changed
+            commit_after = _get_current_commit(staging_path)
+        else:
+            if staging_path.exists():
                 _LOGGER.warning("%s is not a git repo – moving aside", staging_path)
                 _move_aside(staging_path)
-                cloned_repo = git.Repo.clone_from(auth, staging_path, branch=branch)
-                is_new_clone = True
-                repo = cloned_repo
-                commit_before = None
-                commit_after = _get_current_commit(repo)
-            else:
-                # Get commit before fetch/pull
-                commit_before = _get_current_commit(repo)
-
-                repo.remote().set_url(auth)
-                repo.git.fetch("--all", "--prune")
-                try:
-                    repo.git.checkout(branch)
-                except GitCommandError:
-                    repo.git.checkout("-B", branch, f"origin/{branch}")
-                repo.git.pull("--ff-only")
-
-                # Check if commit changed
-                commit_after = _get_current_commit(repo)
-        else:
-            cloned_repo = git.Repo.clone_from(auth, staging_path, branch=branch)
+            _clone(remote_url, staging_path, branch, token, full_history)
             is_new_clone = True
-            repo = cloned_repo
             commit_before = None
-            commit_after = _get_current_commit(repo)
+            commit_after = _get_current_commit(staging_path)
 
         # Find the integration folder in the cloned repo
         integration_source = _find_integration_in_repo(staging_path, slug)
@@ -9,7 +9,7 @@ sys.path.insert(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "..")),
 )
 
-# Override _auth_url so file:// URLs work in tests
+# Override _remote_url so file:// URLs work in tests
 from custom_components.private_repo_loader import loader  # noqa: E402
 
-loader._auth_url = lambda url, token: url
+loader._remote_url = lambda url: url
@@ -4,7 +4,12 @@ from unittest.mock import MagicMock, AsyncMock
 
 import pytest
 
-from custom_components.private_repo_loader.button import RepoSyncButton, RestartHAButton
+from custom_components.private_repo_loader.button import (
+    RepoSyncButton,
+    RestartHAButton,
+    async_setup_entry,
+    repo_device_info,
+)
 from custom_components.private_repo_loader.const import DOMAIN, CONF_REPO, CONF_SLUG
 
 
@@ -12,7 +17,7 @@ from custom_components.private_repo_loader.const import DOMAIN, CONF_REPO, CONF_
 def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = MagicMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_refresh = AsyncMock()
     return coordinator
 
 
@@ -28,27 +33,51 @@ def mock_entry():
     return entry
 
 
+@pytest.mark.asyncio
+async def test_setup_shares_device_info(mock_coordinator, mock_entry):
+    """Test that both buttons of an entry share one device info."""
+    mock_entry.runtime_data = mock_coordinator
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(MagicMock(), mock_entry, async_add_entities)
+
+    sync_button, restart_button = async_add_entities.call_args[0][0]
+    assert sync_button.device_info is restart_button.device_info
+    assert sync_button.device_info["configuration_url"] == (
+        "https://github.com/owner/repo"
+    )
+
+
 class TestRepoSyncButton:
     """Test the RepoSyncButton class."""
 
     def test_unique_id(self, mock_coordinator, mock_entry):
         """Test unique ID generation."""
-        button = RepoSyncButton(mock_coordinator, mock_entry)
+        button = RepoSyncButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         assert button.unique_id == "test_entry_id_sync"
 
     def test_name(self, mock_coordinator, mock_entry):
-        """Test button name."""
-        button = RepoSyncButton(mock_coordinator, mock_entry)
-        assert button.name == "test_repo Sync Now"
+        """Test that the button name comes from its translation key."""
+        button = RepoSyncButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
+        assert button.has_entity_name
+        assert button.translation_key == "sync"
 
     def test_icon(self, mock_coordinator, mock_entry):
         """Test button icon."""
-        button = RepoSyncButton(mock_coordinator, mock_entry)
+        button = RepoSyncButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         assert button.icon == "mdi:sync"
 
     def test_device_info(self, mock_coordinator, mock_entry):
         """Test device info."""
-        button = RepoSyncButton(mock_coordinator, mock_entry)
+        button = RepoSyncButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         device_info = button.device_info
         assert (DOMAIN, "test_entry_id") in device_info["identifiers"]
         assert device_info["name"] == "Private Repo: test_repo"
@@ -56,10 +85,12 @@ class TestRepoSyncButton:
     @pytest.mark.asyncio
     async def test_press_triggers_refresh(self, mock_coordinator, mock_entry):
         """Test that pressing the button triggers coordinator refresh."""
-        button = RepoSyncButton(mock_coordinator, mock_entry)
+        button = RepoSyncButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         await button.async_press()
 
-        mock_coordinator.async_request_refresh.assert_called_once()
+        mock_coordinator.async_refresh.assert_called_once()
 
 
 class TestRestartHAButton:
@@ -67,22 +98,31 @@ class TestRestartHAButton:
 
     def test_unique_id(self, mock_coordinator, mock_entry):
         """Test unique ID generation."""
-        button = RestartHAButton(mock_coordinator, mock_entry)
+        button = RestartHAButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         assert button.unique_id == "test_entry_id_restart"
 
     def test_name(self, mock_coordinator, mock_entry):
-        """Test button name."""
-        button = RestartHAButton(mock_coordinator, mock_entry)
-        assert button.name == "test_repo Restart HA"
+        """Test that the button name comes from its translation key."""
+        button = RestartHAButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
+        assert button.has_entity_name
+        assert button.translation_key == "restart"
 
     def test_icon(self, mock_coordinator, mock_entry):
         """Test button icon."""
-        button = RestartHAButton(mock_coordinator, mock_entry)
+        button = RestartHAButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         assert button.icon == "mdi:restart"
 
     def test_device_info(self, mock_coordinator, mock_entry):
         """Test device info."""
-        button = RestartHAButton(mock_coordinator, mock_entry)
+        button = RestartHAButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
         device_info = button.device_info
         assert (DOMAIN, "test_entry_id") in device_info["identifiers"]
         assert device_info["name"] == "Private Repo: test_repo"
@@ -90,7 +130,9 @@ class TestRestartHAButton:
     @pytest.mark.asyncio
     async def test_press_triggers_restart(self, mock_coordinator, mock_entry):
         """Test that pressing the button triggers HA restart."""
-        button = RestartHAButton(mock_coordinator, mock_entry)
+        button = RestartHAButton(
+            mock_coordinator, mock_entry, repo_device_info(mock_entry)
+        )
 
         # Mock hass
         button.hass = MagicMock()
@@ -1,25 +1,41 @@
 """Tests for the Private Repo Loader config flow."""
 
+import asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
 
-from custom_components.private_repo_loader.config_flow import FlowHandler, OptionsFlow
+from custom_components.private_repo_loader import config_flow
+from custom_components.private_repo_loader.config_flow import (
+    OPTIONS_SCHEMA,
+    FlowHandler,
+    OptionsFlow,
+)
 from custom_components.private_repo_loader.const import (
     CONF_TOKEN,
     CONF_REPO,
     CONF_SLUG,
     CONF_BRANCH,
     CONF_POLL_INTERVAL,
+    CONF_FULL_HISTORY,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_BRANCH,
 )
 from custom_components.private_repo_loader.github_api import (
+    GitHubRepoInfo,
     GitHubValidationResult,
     GitHubError,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty token cache."""
+    config_flow._token_cache.clear()
+    yield
+    config_flow._token_cache.clear()
+
+
 class TestFlowHandler:
     """Test the FlowHandler config flow."""
 
@@ -28,6 +44,9 @@ class TestFlowHandler:
         """Create a FlowHandler instance."""
         handler = FlowHandler()
         handler.hass = MagicMock()
+        handler.hass.async_create_task = MagicMock(
+            side_effect=lambda target, name: asyncio.create_task(target, name=name)
+        )
         handler._async_current_entries = MagicMock(return_value=[])
         handler.async_set_unique_id = AsyncMock()
         handler._abort_if_unique_id_configured = MagicMock()
@@ -49,7 +68,10 @@ class TestFlowHandler:
                 "errors": kwargs.get("errors", {}),
             }
         )
-        return handler
+        with patch.object(
+            config_flow, "async_get_clientsession", return_value=MagicMock()
+        ):
+            yield handler
 
     @pytest.mark.asyncio
     async def test_user_step_no_input_shows_form(self, flow_handler):
@@ -83,10 +105,111 @@ class TestFlowHandler:
         assert result["type"] == "form"
         assert result["step_id"] == "select_repo"
 
+    @pytest.mark.asyncio
+    async def test_select_repo_schema_built_once(self, flow_handler):
+        """Test that re-rendering the selection form reuses its schema."""
+        flow_handler._set_available_repos(
+            [
+                GitHubRepoInfo(
+                    full_name="owner/repo",
+                    name="repo",
+                    private=True,
+                    html_url="https://github.com/owner/repo",
+                    clone_url="https://github.com/owner/repo.git",
+                    default_branch="main",
+                )
+            ]
+        )
+
+        await flow_handler.async_step_select_repo()
+        await flow_handler.async_step_select_repo(user_input={"selected_repo": ""})
+
+        first, second = (
+            call.kwargs["data_schema"]
+            for call in flow_handler.async_show_form.call_args_list
+        )
+        assert first is second
+        assert first({"selected_repo": "owner/repo"}) == {"selected_repo": "owner/repo"}
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
+    async def test_select_repo_creates_entry(self, mock_validate_repo, flow_handler):
+        """Test that selecting a listed repository creates its entry."""
+        mock_validate_repo.return_value = GitHubValidationResult(valid=True)
+        flow_handler._token = "token"
+        flow_handler._set_available_repos(
+            [
+                GitHubRepoInfo(
+                    full_name=f"owner/repo{index}",
+                    name=f"repo{index}",
+                    private=True,
+                    html_url=f"https://github.com/owner/repo{index}",
+                    clone_url=f"https://github.com/owner/repo{index}.git",
+                    default_branch="develop",
+                )
+                for index in range(3)
+            ]
+        )
+
+        result = await flow_handler.async_step_select_repo(
+            user_input={"selected_repo": "owner/repo1"}
+        )
+
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_REPO] == "https://github.com/owner/repo1.git"
+        assert result["data"][CONF_SLUG] == "repo1"
+        assert result["data"][CONF_BRANCH] == "develop"
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_reuses_validated_token(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that resubmitting a validated token does not query GitHub again."""
+        mock_validate.return_value = GitHubValidationResult(
+            valid=True, username="testuser"
+        )
+        mock_list_repos.return_value = []
+
+        await flow_handler.async_step_user(user_input={CONF_TOKEN: "valid_token"})
+        result = await flow_handler.async_step_user(
+            user_input={CONF_TOKEN: "valid_token"}
+        )
+
+        assert result["step_id"] == "select_repo"
+        mock_validate.assert_called_once()
+        mock_list_repos.assert_called_once()
+        assert "valid_token" not in repr(config_flow._token_cache)
+
     @pytest.mark.asyncio
     @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_token_cache_expires(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that a cached token is validated again once the TTL has passed."""
+        mock_validate.return_value = GitHubValidationResult(
+            valid=True, username="testuser"
+        )
+        mock_list_repos.return_value = []
+
+        with patch.object(config_flow.time, "monotonic", return_value=1000.0):
+            await flow_handler.async_step_user(user_input={CONF_TOKEN: "valid_token"})
+        with patch.object(
+            config_flow.time,
+            "monotonic",
+            return_value=1000.0 + config_flow.TOKEN_CACHE_TTL,
+        ):
+            await flow_handler.async_step_user(user_input={CONF_TOKEN: "valid_token"})
+
+        assert mock_validate.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
     async def test_user_step_invalid_token_shows_error(
-        self, mock_validate, flow_handler
+        self, mock_list_repos, mock_validate, flow_handler
     ):
         """Test that invalid token shows error."""
         mock_validate.return_value = GitHubValidationResult(
@@ -102,6 +225,104 @@ class TestFlowHandler:
         assert result["step_id"] == "user"
         assert CONF_TOKEN in result["errors"]
 
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_network_error_is_base_error(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that a network error is reported for the form, not the token."""
+        mock_validate.return_value = GitHubValidationResult(
+            valid=False, error=GitHubError.NETWORK_ERROR
+        )
+
+        result = await flow_handler.async_step_user(user_input={CONF_TOKEN: "token"})
+
+        assert result["errors"] == {"base": "network_error"}
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_lists_repos_during_validation(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that repositories are listed while the token is validated."""
+        listing_started = asyncio.Event()
+
+        async def _validate(session, token):
+            await listing_started.wait()
+            return GitHubValidationResult(valid=True, username="testuser")
+
+        async def _list_repos(session, token):
+            listing_started.set()
+            return []
+
+        mock_validate.side_effect = _validate
+        mock_list_repos.side_effect = _list_repos
+
+        result = await asyncio.wait_for(
+            flow_handler.async_step_user(user_input={CONF_TOKEN: "valid_token"}), 1
+        )
+        assert result["step_id"] == "select_repo"
+        session = config_flow.async_get_clientsession.return_value
+        mock_validate.assert_awaited_once_with(session, "valid_token")
+        mock_list_repos.assert_awaited_once_with(session, "valid_token")
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_invalid_token_cancels_listing(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that an invalid token cancels the repository listing."""
+        cancelled = asyncio.Event()
+
+        async def _list_repos(session, token):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def _validate(session, token):
+            await asyncio.sleep(0)
+            return GitHubValidationResult(valid=False, error=GitHubError.INVALID_TOKEN)
+
+        mock_validate.side_effect = _validate
+        mock_list_repos.side_effect = _list_repos
+
+        await flow_handler.async_step_user(user_input={CONF_TOKEN: "bad_token"})
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_token")
+    @patch("custom_components.private_repo_loader.config_flow.list_user_repos")
+    async def test_user_step_validation_error_cancels_listing(
+        self, mock_list_repos, mock_validate, flow_handler
+    ):
+        """Test that the listing is cancelled if validation raises."""
+        cancelled = asyncio.Event()
+
+        async def _list_repos(session, token):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def _validate(session, token):
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        mock_validate.side_effect = _validate
+        mock_list_repos.side_effect = _list_repos
+
+        with pytest.raises(RuntimeError):
+            await flow_handler.async_step_user(user_input={CONF_TOKEN: "token"})
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+
     @pytest.mark.asyncio
     @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
     async def test_manual_step_creates_entry(self, mock_validate_repo, flow_handler):
@@ -123,6 +344,39 @@ class TestFlowHandler:
         assert result["data"][CONF_SLUG] == "test_repo"
         assert result["options"][CONF_POLL_INTERVAL] == 5
 
+    @pytest.mark.asyncio
+    async def test_manual_step_suggests_token(self, flow_handler):
+        """Test that the manual form is pre-filled with the first step's token."""
+        flow_handler._token = "earlier_token"
+
+        await flow_handler.async_step_manual(user_input=None)
+
+        schema = flow_handler.async_show_form.call_args.kwargs["data_schema"]
+        token_key = next(key for key in schema.schema if key == CONF_TOKEN)
+        assert token_key.description["suggested_value"] == "earlier_token"
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
+    async def test_manual_step_strips_fields(self, mock_validate_repo, flow_handler):
+        """Test that whitespace around the text fields is removed."""
+        mock_validate_repo.return_value = GitHubValidationResult(valid=True)
+        flow_handler._token = " earlier_token "
+
+        result = await flow_handler.async_step_manual(
+            user_input={
+                CONF_REPO: " https://github.com/owner/repo ",
+                CONF_SLUG: " test_repo ",
+                CONF_BRANCH: " dev ",
+            }
+        )
+
+        assert result["data"] == {
+            CONF_REPO: "https://github.com/owner/repo",
+            CONF_SLUG: "test_repo",
+            CONF_BRANCH: "dev",
+            CONF_TOKEN: "earlier_token",
+        }
+
     @pytest.mark.asyncio
     async def test_manual_step_validates_required_repo(self, flow_handler):
         """Test that repo URL is required."""
@@ -167,6 +421,64 @@ class TestFlowHandler:
         assert result["type"] == "create_entry"
         assert result["data"][CONF_SLUG] == "my-integration"
 
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
+    async def test_manual_step_git_suffix_url(self, mock_validate_repo, flow_handler):
+        """Test that a .git URL is validated against the bare repository name."""
+        mock_validate_repo.return_value = GitHubValidationResult(valid=True)
+
+        result = await flow_handler.async_step_manual(
+            user_input={
+                CONF_REPO: "https://github.com/owner/my-integration.git",
+                CONF_SLUG: "",
+                CONF_TOKEN: "token",
+            }
+        )
+
+        assert result["data"][CONF_SLUG] == "my-integration"
+        mock_validate_repo.assert_called_once_with(
+            config_flow.async_get_clientsession.return_value,
+            "token",
+            "owner",
+            "my-integration",
+        )
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
+    async def test_manual_step_validates_github_subpage_url(
+        self, mock_validate_repo, flow_handler
+    ):
+        """Test that a GitHub URL below the repository is still validated."""
+        mock_validate_repo.return_value = GitHubValidationResult(valid=True)
+
+        result = await flow_handler.async_step_manual(
+            user_input={
+                CONF_REPO: "https://github.com/owner/my-integration/tree/dev",
+                CONF_SLUG: "",
+                CONF_TOKEN: "token",
+            }
+        )
+
+        assert result["data"][CONF_SLUG] == "my-integration"
+        mock_validate_repo.assert_called_once()
+        assert mock_validate_repo.call_args[0][-2:] == ("owner", "my-integration")
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
+    async def test_manual_step_accepts_other_https_hosts(
+        self, mock_validate_repo, flow_handler
+    ):
+        """Test that non-GitHub https URLs are accepted without validation."""
+        result = await flow_handler.async_step_manual(
+            user_input={
+                CONF_REPO: "https://git.example.com/owner/repo.git",
+                CONF_SLUG: "repo",
+            }
+        )
+
+        assert result["type"] == "create_entry"
+        mock_validate_repo.assert_not_called()
+
     @pytest.mark.asyncio
     @patch("custom_components.private_repo_loader.config_flow.validate_repo_access")
     async def test_manual_step_repo_not_found_error(
@@ -213,6 +525,24 @@ class TestFlowHandler:
         assert result["type"] == "form"
         assert result["errors"][CONF_TOKEN] == "insufficient_permissions"
 
+    @pytest.mark.asyncio
+    async def test_import_step_creates_entry(self, flow_handler):
+        """Test that an imported v1 repository becomes its own entry."""
+        result = await flow_handler.async_step_import(
+            {
+                CONF_REPO: "https://github.com/owner/my_component.git",
+                CONF_SLUG: "",
+                CONF_BRANCH: "",
+                CONF_TOKEN: "old_token",
+            }
+        )
+
+        assert result["type"] == "create_entry"
+        assert result["title"] == "my_component"
+        assert result["data"][CONF_BRANCH] == DEFAULT_BRANCH
+        assert result["options"][CONF_TOKEN] == "old_token"
+        flow_handler._abort_if_unique_id_configured.assert_called_once()
+
 
 class TestOptionsFlow:
     """Test the OptionsFlow config flow."""
@@ -257,15 +587,31 @@ class TestOptionsFlow:
         assert result["type"] == "form"
         assert result["step_id"] == "init"
 
+    @pytest.mark.asyncio
+    async def test_init_step_suggests_current_values(self, options_flow):
+        """Test that the options form is pre-filled with the current options."""
+        await options_flow.async_step_init(user_input=None)
+
+        schema = options_flow.async_show_form.call_args.kwargs["data_schema"]
+        suggested = {
+            str(key): key.description["suggested_value"] for key in schema.schema
+        }
+        assert suggested[CONF_BRANCH] == "main"
+        assert suggested[CONF_TOKEN] == "default_token"
+        assert suggested[CONF_POLL_INTERVAL] == 5
+        assert suggested[CONF_FULL_HISTORY] is False
+
     @pytest.mark.asyncio
     async def test_init_step_saves_options(self, options_flow):
         """Test that submitting options saves them."""
         result = await options_flow.async_step_init(
-            user_input={
-                CONF_BRANCH: "develop",
-                CONF_TOKEN: "new_token",
-                CONF_POLL_INTERVAL: 10,
-            }
+            user_input=OPTIONS_SCHEMA(
+                {
+                    CONF_BRANCH: "develop",
+                    CONF_TOKEN: "new_token",
+                    CONF_POLL_INTERVAL: 10,
+                }
+            )
         )
         assert result["type"] == "create_entry"
         assert result["data"][CONF_BRANCH] == "develop"
@@ -276,12 +622,49 @@ class TestOptionsFlow:
     async def test_options_preserve_defaults(self, options_flow, mock_entry):
         """Test that empty values use defaults."""
         result = await options_flow.async_step_init(
-            user_input={
-                CONF_BRANCH: "",
-                CONF_TOKEN: "",
-                CONF_POLL_INTERVAL: 1,
-            }
+            user_input=OPTIONS_SCHEMA(
+                {
+                    CONF_BRANCH: " ",
+                    CONF_TOKEN: " ",
+                    CONF_POLL_INTERVAL: 1,
+                }
+            )
         )
         assert result["type"] == "create_entry"
         assert result["data"][CONF_BRANCH] == DEFAULT_BRANCH
         assert result["data"][CONF_TOKEN] == ""
+        assert result["data"][CONF_FULL_HISTORY] is False
+
+    @pytest.mark.asyncio
+    async def test_options_keep_keys_not_on_form(self, options_flow, mock_entry):
+        """Test that options the form does not show are carried over."""
+        mock_entry.options = {**mock_entry.options, "future_option": "kept"}
+
+        result = await options_flow.async_step_init(
+            user_input=OPTIONS_SCHEMA({CONF_BRANCH: "develop"})
+        )
+
+        assert result["data"]["future_option"] == "kept"
+        assert result["data"][CONF_BRANCH] == "develop"
+
+    @pytest.mark.asyncio
+    @patch("custom_components.private_repo_loader.config_flow.invalidate_token_cache")
+    async def test_options_token_is_checked_again(self, mock_invalidate, options_flow):
+        """Test that saving a token clears any cached rejection of it."""
+        await options_flow.async_step_init(
+            user_input=OPTIONS_SCHEMA({CONF_TOKEN: "new_token"})
+        )
+
+        mock_invalidate.assert_called_once_with("new_token")
+
+    @pytest.mark.asyncio
+    async def test_options_cleared_fields_use_defaults(self, options_flow):
+        """Test that fields cleared from the form fall back to their defaults."""
+        result = await options_flow.async_step_init(user_input=OPTIONS_SCHEMA({}))
+
+        assert result["data"] == {
+            CONF_BRANCH: DEFAULT_BRANCH,
+            CONF_TOKEN: "",
+            CONF_POLL_INTERVAL: DEFAULT_POLL_INTERVAL,
+            CONF_FULL_HISTORY: False,
+        }
@@ -1,13 +1,21 @@
 """Tests for the sliding scale polling coordinator."""
 
-from datetime import datetime, timedelta
+import asyncio
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, AsyncMock, patch
 
 import pytest
 
 from custom_components.private_repo_loader.coordinator import (
     PrivateRepoCoordinator,
+    async_get_sync_executor,
+    async_shutdown_sync_executor,
     calculate_poll_interval,
+    calculate_startup_delay,
+)
+from custom_components.private_repo_loader.github_api import (
+    GitHubBranchHead,
+    GitHubError,
 )
 from custom_components.private_repo_loader.const import (
     CONF_REPO,
@@ -16,6 +24,10 @@ from custom_components.private_repo_loader.const import (
     CONF_TOKEN,
     CONF_POLL_INTERVAL,
     CONF_LAST_CHANGED,
+    CONF_LAST_COMMIT,
+    CONF_REMOTE_HEAD,
+    DATA_EXECUTOR,
+    DOMAIN,
     POLL_INTERVAL_1_DAY,
     POLL_INTERVAL_1_WEEK,
     POLL_INTERVAL_1_MONTH,
@@ -68,6 +80,31 @@ class TestCalculatePollInterval:
         result = calculate_poll_interval(last_changed, base_interval=5)
         assert result == 5
 
+    def test_aware_last_changed(self):
+        """Test that timezone-aware timestamps are handled."""
+        last_changed = datetime.now(UTC) - timedelta(days=8)
+        result = calculate_poll_interval(last_changed, base_interval=1)
+        assert result == POLL_INTERVAL_1_WEEK
+
+
+class TestCalculateStartupDelay:
+    """Test the calculate_startup_delay function."""
+
+    def test_delay_is_stable_and_bounded(self):
+        """Test that a repo always gets the same delay within the window."""
+        url = "https://github.com/owner/repo"
+        delay = calculate_startup_delay(url, max_delay=60)
+        assert 0 <= delay < 60
+        assert calculate_startup_delay(url, max_delay=60) == delay
+
+    def test_delays_are_spread(self):
+        """Test that different repos get different delays."""
+        delays = {
+            calculate_startup_delay(f"https://github.com/owner/repo{i}")
+            for i in range(20)
+        }
+        assert len(delays) > 1
+
 
 class TestPrivateRepoCoordinator:
     """Test the PrivateRepoCoordinator class."""
@@ -77,7 +114,8 @@ class TestPrivateRepoCoordinator:
         """Create a mock Home Assistant instance."""
         hass = MagicMock()
         hass.config.path = lambda x: f"/tmp/test_config/{x}"
-        hass.async_add_executor_job = AsyncMock()
+        hass.data = {}
+        hass.loop.run_in_executor = AsyncMock()
         hass.config_entries.async_update_entry = MagicMock()
         return hass
 
@@ -143,7 +181,7 @@ class TestPrivateRepoCoordinator:
             mock_result.has_changes = True
             mock_result.commit_sha = "abc123"
             mock_result.error = None
-            mock_hass.async_add_executor_job.return_value = mock_result
+            mock_hass.loop.run_in_executor.return_value = mock_result
 
             result = await coordinator._async_update_data()
 
@@ -162,9 +200,361 @@ class TestPrivateRepoCoordinator:
         mock_result.has_changes = False
         mock_result.commit_sha = "abc123"
         mock_result.error = None
-        mock_hass.async_add_executor_job.return_value = mock_result
+        mock_hass.loop.run_in_executor.return_value = mock_result
 
         result = await coordinator._async_update_data()
 
         assert result["status"] == "unchanged"
         assert result["has_changes"] is False
+
+    @pytest.mark.asyncio
+    async def test_coordinator_update_uses_sync_executor(self, mock_hass, mock_entry):
+        """Test that syncs run on the dedicated pool, not the shared executor."""
+        coordinator = PrivateRepoCoordinator(mock_hass, mock_entry)
+
+        mock_result = MagicMock()
+        mock_result.status = "unchanged"
+        mock_result.has_changes = False
+        mock_result.commit_sha = "abc123"
+        mock_result.error = None
+        mock_hass.loop.run_in_executor.return_value = mock_result
+
+        await coordinator._async_update_data()
+
+        executor = mock_hass.data[DOMAIN][DATA_EXECUTOR]
+        assert mock_hass.loop.run_in_executor.call_args[0][0] is executor
+        async_shutdown_sync_executor(mock_hass)
+
+
+class TestRemoteHeadCheck:
+    """Test skipping git when the remote branch head is unchanged."""
+
+    @pytest.fixture
+    def mock_hass(self):
+        """Create a mock Home Assistant instance."""
+        hass = MagicMock()
+        hass.config.path = lambda x: f"/tmp/test_config/{x}"
+        hass.data = {}
+        hass.loop.run_in_executor = AsyncMock()
+        hass.config_entries.async_update_entry = MagicMock()
+        return hass
+
+    @pytest.fixture
+    def coordinator(self, mock_hass):
+        """Create a coordinator that has already synced commit abc123."""
+        entry = MagicMock()
+        entry.entry_id = "test_entry_id"
+        entry.data = {
+            CONF_REPO: "https://github.com/owner/repo",
+            CONF_SLUG: "test_repo",
+            CONF_BRANCH: "main",
+            CONF_TOKEN: "test_token",
+        }
+        entry.options = {CONF_POLL_INTERVAL: 1}
+        coordinator = PrivateRepoCoordinator(mock_hass, entry)
+        coordinator._last_commit_sha = "abc123"
+        return coordinator
+
+    @pytest.fixture
+    def mock_branch_head(self):
+        """Patch the GitHub branch head lookup."""
+        with (
+            patch(
+                "custom_components.private_repo_loader.coordinator.get_branch_head",
+                new_callable=AsyncMock,
+            ) as mock_head,
+            patch(
+                "custom_components.private_repo_loader.coordinator.async_get_clientsession"
+            ),
+        ):
+            yield mock_head
+
+    @pytest.mark.asyncio
+    async def test_unchanged_head_skips_git(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that git is not run when the branch head matches."""
+        mock_branch_head.return_value = GitHubBranchHead(sha="abc123", etag='"e1"')
+
+        result = await coordinator._async_update_data()
+
+        assert result["status"] == "unchanged"
+        assert result["commit_sha"] == "abc123"
+        mock_hass.loop.run_in_executor.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_moved_head_runs_git(self, mock_hass, coordinator, mock_branch_head):
+        """Test that git runs when the branch head has moved."""
+        mock_branch_head.return_value = GitHubBranchHead(sha="def456", etag='"e2"')
+        mock_result = MagicMock()
+        mock_result.status = "updated"
+        mock_result.has_changes = True
+        mock_result.commit_sha = "def456"
+        mock_result.error = None
+        mock_hass.loop.run_in_executor.return_value = mock_result
+
+        result = await coordinator._async_update_data()
+
+        assert result["status"] == "updated"
+        mock_hass.loop.run_in_executor.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_not_modified_sends_cached_etag(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that a 304 reuses the SHA cached with the ETag."""
+        mock_branch_head.return_value = GitHubBranchHead(sha="abc123", etag='"e1"')
+        await coordinator._async_update_data()
+
+        mock_branch_head.return_value = GitHubBranchHead(etag='"e1"', not_modified=True)
+        result = await coordinator._async_update_data()
+
+        assert mock_branch_head.call_args[0][5] == '"e1"'
+        assert result["status"] == "unchanged"
+        mock_hass.loop.run_in_executor.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lookup_error_runs_git(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that a failed lookup falls back to running git."""
+        mock_branch_head.return_value = GitHubBranchHead(
+            error=GitHubError.NETWORK_ERROR
+        )
+        mock_result = MagicMock()
+        mock_result.status = "unchanged"
+        mock_result.has_changes = False
+        mock_result.commit_sha = "abc123"
+        mock_result.error = None
+        mock_hass.loop.run_in_executor.return_value = mock_result
+
+        await coordinator._async_update_data()
+
+        mock_hass.loop.run_in_executor.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_force_sync_skips_lookup(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that a forced sync always runs git."""
+        mock_result = MagicMock()
+        mock_result.status = "unchanged"
+        mock_result.has_changes = False
+        mock_result.commit_sha = "abc123"
+        mock_result.error = None
+        mock_hass.loop.run_in_executor.return_value = mock_result
+
+        result = await coordinator.async_force_sync()
+
+        mock_branch_head.assert_not_called()
+        mock_hass.loop.run_in_executor.assert_called_once()
+        assert coordinator.data is result
+
+    @pytest.mark.asyncio
+    async def test_remote_head_persisted_with_changes(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that the branch lookup is stored alongside last_changed."""
+        mock_branch_head.return_value = GitHubBranchHead(sha="def456", etag='"e2"')
+        mock_result = MagicMock()
+        mock_result.status = "updated"
+        mock_result.has_changes = True
+        mock_result.commit_sha = "def456"
+        mock_result.error = None
+        mock_hass.loop.run_in_executor.return_value = mock_result
+
+        await coordinator._async_update_data()
+
+        new_data = mock_hass.config_entries.async_update_entry.call_args[1]["data"]
+        assert new_data[CONF_REMOTE_HEAD] == ['"e2"', "def456"]
+
+    def test_remote_head_restored_from_entry(self, mock_hass, coordinator):
+        """Test that a stored branch lookup is restored on startup."""
+        entry = coordinator.entry
+        entry.data = {**entry.data, CONF_REMOTE_HEAD: ['"e1"', "abc123"]}
+
+        restored = PrivateRepoCoordinator(mock_hass, entry)
+
+        assert restored._remote_head == ('"e1"', "abc123")
+
+    @pytest.mark.asyncio
+    async def test_not_modified_after_restart_skips_git(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that the first poll after a restart can be answered by a 304."""
+        entry = coordinator.entry
+        entry.data = {
+            **entry.data,
+            CONF_REMOTE_HEAD: ['"e1"', "abc123"],
+            CONF_LAST_COMMIT: "abc123",
+        }
+        restored = PrivateRepoCoordinator(mock_hass, entry)
+        mock_branch_head.return_value = GitHubBranchHead(etag='"e1"', not_modified=True)
+
+        result = await restored._async_update_data()
+
+        assert mock_branch_head.call_args[0][5] == '"e1"'
+        assert result["status"] == "unchanged"
+        mock_hass.loop.run_in_executor.assert_not_called()
+        mock_hass.config_entries.async_update_entry.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_synced_commit_persisted_without_changes(
+        self, mock_hass, coordinator, mock_branch_head
+    ):
+        """Test that an unchanged sync still stores the commit and lookup."""
+        mock_branch_head.return_value = GitHubBranchHead(sha="abc123", etag='"e1"')
+
+        await coordinator._async_update_data()
+
+        new_data = mock_hass.config_entries.async_update_entry.call_args[1]["data"]
+        assert new_data[CONF_LAST_COMMIT] == "abc123"
+        assert new_data[CONF_REMOTE_HEAD] == ['"e1"', "abc123"]
+        assert CONF_LAST_CHANGED not in new_data
+
+
+class TestSyncCoalescing:
+    """Test that overlapping syncs share a run instead of racing."""
+
+    @pytest.fixture
+    def gate(self):
+        """Return an event that holds the mocked git sync until set."""
+        return asyncio.Event()
+
+    @pytest.fixture
+    def coordinator(self, gate):
+        """Create a coordinator whose git sync blocks on the gate."""
+        hass = MagicMock()
+        hass.config.path = lambda x: f"/tmp/test_config/{x}"
+        hass.data = {}
+        hass.config_entries.async_update_entry = MagicMock()
+
+        async def _run_in_executor(*args):
+            await gate.wait()
+            result = MagicMock()
+            result.status = "unchanged"
+            result.has_changes = False
+            result.commit_sha = None
+            result.error = None
+            return result
+
+        hass.loop.run_in_executor = AsyncMock(side_effect=_run_in_executor)
+
+        entry = MagicMock()
+        entry.entry_id = "test_entry_id"
+        entry.data = {
+            CONF_REPO: "https://github.com/owner/repo",
+            CONF_SLUG: "test_repo",
+            CONF_BRANCH: "main",
+            CONF_TOKEN: "test_token",
+        }
+        entry.options = {CONF_POLL_INTERVAL: 1}
+        return PrivateRepoCoordinator(hass, entry)
+
+    @pytest.mark.asyncio
+    async def test_poll_during_sync_reuses_result(self, coordinator, gate):
+        """Test that a poll arriving mid-sync waits for that sync's result."""
+        first = asyncio.create_task(coordinator._async_update_data())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(coordinator._async_update_data())
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await first is await second
+        coordinator.hass.loop.run_in_executor.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_forced_syncs_during_sync_share_one_follow_up(
+        self, coordinator, gate
+    ):
+        """Test that forced syncs queue exactly one run after the current one."""
+        running = asyncio.create_task(coordinator._async_update_data())
+        await asyncio.sleep(0)
+        forced = [asyncio.create_task(coordinator.async_force_sync()) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+
+        await running
+        results = await asyncio.gather(*forced)
+
+        assert results[0] is results[1] is results[2]
+        assert coordinator.hass.loop.run_in_executor.call_count == 2
+
+
+class TestDeferredPolling:
+    """Test that deferred polling starts from the first sync."""
+
+    @pytest.fixture
+    def mock_hass(self):
+        """Create a mock Home Assistant instance."""
+        hass = MagicMock()
+        hass.config.path = lambda x: f"/tmp/test_config/{x}"
+        hass.data = {}
+        hass.is_stopping = False
+        mock_result = MagicMock()
+        mock_result.status = "unchanged"
+        mock_result.has_changes = False
+        mock_result.commit_sha = "abc123"
+        mock_result.error = None
+        hass.loop.run_in_executor = AsyncMock(return_value=mock_result)
+        hass.config_entries.async_update_entry = MagicMock()
+        return hass
+
+    def _coordinator(self, hass, slug):
+        """Create a deferred coordinator with one subscribed entity."""
+        entry = MagicMock()
+        entry.entry_id = slug
+        entry.pref_disable_polling = False
+        entry.data = {CONF_REPO: f"https://github.com/owner/{slug}", CONF_SLUG: slug}
+        entry.options = {CONF_POLL_INTERVAL: 1}
+        coordinator = PrivateRepoCoordinator(hass, entry, defer_polling=True)
+        coordinator.async_add_listener(MagicMock())
+        return coordinator
+
+    @pytest.mark.asyncio
+    async def test_polls_keep_the_first_sync_offsets(self, mock_hass):
+        """Test that each repository polls one interval after its first sync."""
+        first = self._coordinator(mock_hass, "first")
+        second = self._coordinator(mock_hass, "second")
+        assert first.current_poll_interval == 1
+        mock_hass.loop.call_at.assert_not_called()
+
+        mock_hass.loop.time.return_value = 10
+        await first.async_first_sync()
+        mock_hass.loop.time.return_value = 40
+        await second.async_first_sync()
+
+        poll_times = [call[0][0] for call in mock_hass.loop.call_at.call_args_list]
+        assert [int(poll_time) for poll_time in poll_times] == [70, 100]
+
+
+class TestSyncExecutor:
+    """Test the dedicated git sync thread pool."""
+
+    def test_executor_is_shared(self):
+        """Test that the executor is created once and reused."""
+        hass = MagicMock()
+        hass.data = {}
+
+        executor = async_get_sync_executor(hass)
+
+        assert async_get_sync_executor(hass) is executor
+        async_shutdown_sync_executor(hass)
+
+    def test_shutdown_removes_executor(self):
+        """Test that shutdown drops the executor so it can be recreated."""
+        hass = MagicMock()
+        hass.data = {}
+        executor = async_get_sync_executor(hass)
+
+        async_shutdown_sync_executor(hass)
+
+        assert DATA_EXECUTOR not in hass.data[DOMAIN]
+        assert async_get_sync_executor(hass) is not executor
+        async_shutdown_sync_executor(hass)
+
+    def test_shutdown_without_executor(self):
+        """Test that shutdown is a no-op when no executor was created."""
+        hass = MagicMock()
+        hass.data = {}
+        async_shutdown_sync_executor(hass)
@@ -1,10 +1,16 @@
 """Tests for the GitHub API helper."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch, MagicMock
 
+import aiohttp
 import pytest
 
+from custom_components.private_repo_loader import github_api
 from custom_components.private_repo_loader.github_api import (
+    _get_json,
+    get_branch_head,
+    invalidate_token_cache,
     validate_token,
     validate_repo_access,
     list_user_repos,
@@ -14,6 +20,30 @@ from custom_components.private_repo_loader.github_api import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Start every test with empty response and rejected token caches."""
+    github_api._response_cache.clear()
+    github_api._bad_token_cache.clear()
+    yield
+    github_api._response_cache.clear()
+    github_api._bad_token_cache.clear()
+
+
+def _mock_session(response):
+    """Create a mock shared session returning the given response."""
+    session = MagicMock()
+    session.get = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(return_value=response))
+    )
+    return session
+
+
+def _body(headers, data):
+    """Parse a response into its decoded body."""
+    return data
+
+
 class TestParseGitHubUrl:
     """Test the parse_github_url function."""
 
@@ -69,81 +99,116 @@ class TestValidateToken:
     @pytest.mark.asyncio
     async def test_empty_token_returns_invalid(self):
         """Test that empty token returns invalid result."""
-        result = await validate_token("")
+        result = await validate_token(MagicMock(), "")
         assert result.valid is False
         assert result.error == GitHubError.INVALID_TOKEN
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_valid_token_returns_username(self, mock_session_class):
+    async def test_valid_token_returns_username(self):
         """Test that valid token returns username."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 200
         mock_response.json = AsyncMock(return_value={"login": "testuser"})
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
-        result = await validate_token("valid_token")
+        result = await validate_token(mock_session, "valid_token")
         assert result.valid is True
         assert result.username == "testuser"
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_invalid_token_returns_error(self, mock_session_class):
+    async def test_invalid_token_returns_error(self):
         """Test that invalid token returns error."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 401
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
-        result = await validate_token("invalid_token")
+        result = await validate_token(mock_session, "invalid_token")
         assert result.valid is False
         assert result.error == GitHubError.INVALID_TOKEN
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_rate_limited_returns_error(self, mock_session_class):
+    async def test_rate_limited_returns_error(self):
         """Test that rate limiting returns error."""
         mock_response = AsyncMock()
         mock_response.status = 403
         mock_response.headers = {"X-RateLimit-Remaining": "0"}
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
+        mock_session = _mock_session(mock_response)
 
-        mock_session_class.return_value = mock_session
-
-        result = await validate_token("token")
+        result = await validate_token(mock_session, "token")
         assert result.valid is False
         assert result.error == GitHubError.RATE_LIMITED
 
 
+class TestRejectedTokenCache:
+    """Test that tokens GitHub rejected are not sent again."""
+
+    @staticmethod
+    def _session(status, headers=None):
+        """Return a session mock whose requests answer with status."""
+        mock_response = AsyncMock()
+        mock_response.status = status
+        mock_response.headers = headers or {}
+        return _mock_session(mock_response)
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_is_not_sent_again(self):
+        """Test that a 401 is remembered for both validation calls."""
+        session = self._session(401)
+        first = await validate_token(session, "revoked")
+        second = await validate_token(session, "revoked")
+        repo = await validate_repo_access(session, "revoked", "owner", "repo")
+
+        assert first.error == second.error == repo.error == GitHubError.INVALID_TOKEN
+        assert session.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_token_cache(self):
+        """Test that invalidating a token checks it with GitHub again."""
+        session = self._session(401)
+        await validate_token(session, "revoked")
+        invalidate_token_cache("revoked")
+        await validate_token(session, "revoked")
+
+        assert session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rejection_expires(self):
+        """Test that a rejection is forgotten after the cache TTL."""
+        session = self._session(401)
+        with patch.object(github_api.time, "monotonic", return_value=0.0):
+            await validate_token(session, "revoked")
+        with patch.object(
+            github_api.time,
+            "monotonic",
+            return_value=github_api.BAD_TOKEN_CACHE_TTL,
+        ):
+            await validate_token(session, "revoked")
+
+        assert session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_permission_errors_are_not_cached(self):
+        """Test that a 403 is not cached, since access can be granted later."""
+        session = self._session(403, {"X-RateLimit-Remaining": "10"})
+        await validate_repo_access(session, "token", "owner", "repo")
+        await validate_repo_access(session, "token", "owner", "repo")
+
+        assert session.get.call_count == 2
+
+
 class TestValidateRepoAccess:
     """Test the validate_repo_access function."""
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_accessible_repo_returns_valid(self, mock_session_class):
+    async def test_accessible_repo_returns_valid(self):
         """Test that accessible repo returns valid."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 200
         mock_response.json = AsyncMock(
             return_value={
@@ -152,62 +217,39 @@ class TestValidateRepoAccess:
             }
         )
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
-        result = await validate_repo_access("token", "owner", "repo")
+        result = await validate_repo_access(mock_session, "token", "owner", "repo")
         assert result.valid is True
         assert result.repo_info is not None
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_private_repo_without_token_returns_not_found(
-        self, mock_session_class
-    ):
+    async def test_private_repo_without_token_returns_not_found(self):
         """Test that private repo without token returns not found."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 404
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
-        result = await validate_repo_access("", "BitBasherr", "Custom-Entity-Private")
+        result = await validate_repo_access(
+            mock_session, "", "BitBasherr", "Custom-Entity-Private"
+        )
         assert result.valid is False
         assert result.error == GitHubError.REPO_NOT_FOUND
         assert "PAT" in result.error_message
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_private_repo_with_bad_token_returns_not_found(
-        self, mock_session_class
-    ):
+    async def test_private_repo_with_bad_token_returns_not_found(self):
         """Test that private repo with bad token returns not found."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 404
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
         result = await validate_repo_access(
-            "bad_token", "BitBasherr", "Custom-Entity-Private"
+            mock_session, "bad_token", "BitBasherr", "Custom-Entity-Private"
         )
         assert result.valid is False
         assert result.error == GitHubError.REPO_NOT_FOUND
@@ -217,23 +259,15 @@ class TestValidateRepoAccess:
         )
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_insufficient_permissions_returns_error(self, mock_session_class):
+    async def test_insufficient_permissions_returns_error(self):
         """Test that 403 returns insufficient permissions."""
         mock_response = AsyncMock()
         mock_response.status = 403
         mock_response.headers = {"X-RateLimit-Remaining": "100"}
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
-        result = await validate_repo_access("token", "owner", "repo")
+        result = await validate_repo_access(mock_session, "token", "owner", "repo")
         assert result.valid is False
         assert result.error == GitHubError.INSUFFICIENT_PERMISSIONS
 
@@ -244,14 +278,14 @@ class TestListUserRepos:
     @pytest.mark.asyncio
     async def test_empty_token_returns_empty_list(self):
         """Test that empty token returns empty list."""
-        result = await list_user_repos("")
+        result = await list_user_repos(MagicMock(), "")
         assert result == []
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_returns_repo_list(self, mock_session_class):
+    async def test_returns_repo_list(self):
         """Test that valid token returns repo list."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 200
         mock_response.json = AsyncMock(
             return_value=[
@@ -276,22 +310,121 @@ class TestListUserRepos:
             ]
         )
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
+        mock_session = _mock_session(mock_response)
 
-        mock_session_class.return_value = mock_session
-
-        result = await list_user_repos("valid_token")
+        result = await list_user_repos(mock_session, "valid_token")
         assert len(result) == 2
         assert result[0].full_name == "owner/repo1"
         assert result[0].private is False
         assert result[1].full_name == "owner/repo2"
         assert result[1].private is True
 
+    @staticmethod
+    def _paged_session(last_page, requested, failing=(), not_modified=()):
+        """Return a session serving one repository per page.
+
+        Pages after the first answer only once every page up to last_page
+        has been requested, so the listing hangs unless they are concurrent.
+        Requests for pages in failing raise a network error, and pages in
+        not_modified answer with a bare 304.
+        """
+        all_requested = asyncio.Event()
+
+        async def _respond(page):
+            requested.append(page)
+            if page > 1 and len(requested) >= min(
+                last_page, github_api.REPO_LIST_MAX_PAGES
+            ):
+                all_requested.set()
+            if page > 1:
+                await all_requested.wait()
+            if page in failing:
+                raise aiohttp.ClientConnectionError("connection reset")
+            response = AsyncMock()
+            if page in not_modified:
+                response.status = 304
+                response.headers = {}
+                return response
+            response.status = 200
+            response.headers = {
+                "ETag": f'"page{page}"',
+                "Link": (
+                    '<https://api.github.com/user/repos?per_page=100&page=2>; rel="next", '
+                    f"<https://api.github.com/user/repos?per_page=100&page={last_page}>; "
+                    'rel="last"'
+                ),
+            }
+            response.json = AsyncMock(
+                return_value=[
+                    {
+                        "full_name": f"owner/repo{page}",
+                        "name": f"repo{page}",
+                        "private": True,
+                        "html_url": f"https://github.com/owner/repo{page}",
+                        "clone_url": f"https://github.com/owner/repo{page}.git",
+                    }
+                ]
+            )
+            return response
+
+        def _get(url, headers, params):
+            async def _enter():
+                return await _respond(int(params["page"]))
+
+            return AsyncMock(__aenter__=AsyncMock(side_effect=_enter))
+
+        session = MagicMock()
+        session.get = MagicMock(side_effect=_get)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_fetches_remaining_pages_concurrently(self):
+        """Test that pages after the first are requested together, in order."""
+        requested = []
+        session = self._paged_session(4, requested)
+
+        result = await asyncio.wait_for(list_user_repos(session, "token"), 1)
+
+        assert requested[0] == 1
+        assert sorted(requested) == [1, 2, 3, 4]
+        assert [repo.name for repo in result] == ["repo1", "repo2", "repo3", "repo4"]
+
+    @pytest.mark.asyncio
+    async def test_failed_page_keeps_other_pages(self, caplog):
+        """Test that a page failing to load does not drop the pages that did."""
+        requested = []
+        session = self._paged_session(4, requested, failing={3})
+
+        result = await asyncio.wait_for(list_user_repos(session, "token"), 1)
+
+        assert [repo.name for repo in result] == ["repo1", "repo2", "repo4"]
+        assert "page 3" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_page_limit(self):
+        """Test that no more than the maximum number of pages is fetched."""
+        requested = []
+        session = self._paged_session(25, requested)
+
+        result = await asyncio.wait_for(list_user_repos(session, "token"), 1)
+
+        assert sorted(requested) == list(range(1, github_api.REPO_LIST_MAX_PAGES + 1))
+        assert len(result) == github_api.REPO_LIST_MAX_PAGES
+
+    @pytest.mark.asyncio
+    async def test_not_modified_first_page_keeps_page_count(self):
+        """Test that a 304 without a Link header still fetches pages 2..N."""
+        await asyncio.wait_for(list_user_repos(self._paged_session(3, []), "token"), 1)
+
+        requested = []
+        session = self._paged_session(3, requested, not_modified={1})
+        result = await asyncio.wait_for(list_user_repos(session, "token"), 1)
+
+        first_headers = session.get.call_args_list[0][1]["headers"]
+        assert first_headers["If-None-Match"] == '"page1"'
+        assert sorted(requested) == [1, 2, 3]
+        assert [repo.name for repo in result] == ["repo1", "repo2", "repo3"]
+
 
 class TestGitHubRepoInfo:
     """Test GitHubRepoInfo dataclass."""
@@ -316,12 +449,10 @@ class TestPrivateRepoScenarios:
     """Test scenarios specific to private repositories."""
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_bitbasherr_custom_entity_private_with_valid_token(
-        self, mock_session_class
-    ):
+    async def test_bitbasherr_custom_entity_private_with_valid_token(self):
         """Test accessing BitBasherr/Custom-Entity-Private with valid token."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 200
         mock_response.json = AsyncMock(
             return_value={
@@ -334,28 +465,22 @@ class TestPrivateRepoScenarios:
             }
         )
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
         result = await validate_repo_access(
-            "valid_pat_with_repo_scope", "BitBasherr", "Custom-Entity-Private"
+            mock_session,
+            "valid_pat_with_repo_scope",
+            "BitBasherr",
+            "Custom-Entity-Private",
         )
         assert result.valid is True
         assert result.repo_info["private"] is True
 
     @pytest.mark.asyncio
-    @patch("aiohttp.ClientSession")
-    async def test_bitbasherr_custom_entity_public_without_token(
-        self, mock_session_class
-    ):
+    async def test_bitbasherr_custom_entity_public_without_token(self):
         """Test accessing BitBasherr/Custom-Entity (public) without token."""
         mock_response = AsyncMock()
+        mock_response.headers = {}
         mock_response.status = 200
         mock_response.json = AsyncMock(
             return_value={
@@ -368,19 +493,176 @@ class TestPrivateRepoScenarios:
             }
         )
 
-        mock_session = MagicMock()
-        mock_session.get = MagicMock(
-            return_value=AsyncMock(__aenter__=AsyncMock(return_value=mock_response))
-        )
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock()
-
-        mock_session_class.return_value = mock_session
+        mock_session = _mock_session(mock_response)
 
         result = await validate_repo_access(
+            mock_session,
             "",  # No token needed for public repos
             "BitBasherr",
             "Custom-Entity",
         )
         assert result.valid is True
         assert result.repo_info["private"] is False
+
+
+class TestGetJson:
+    """Test the conditional request cache behind the JSON endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_revalidates_with_etag(self):
+        """Test that a cached response is revalidated and reused on a 304."""
+        first = AsyncMock()
+        first.status = 200
+        first.headers = {"ETag": '"etag1"'}
+        first.json = AsyncMock(return_value={"login": "testuser"})
+        session = _mock_session(first)
+        await _get_json(session, "https://api.github.com/user", "token", {}, _body)
+
+        second = AsyncMock()
+        second.status = 304
+        second.headers = {}
+        session = _mock_session(second)
+        status, _, data = await _get_json(
+            session, "https://api.github.com/user", "token", {}, _body
+        )
+
+        assert session.get.call_args[1]["headers"]["If-None-Match"] == '"etag1"'
+        assert status == 200
+        assert data == {"login": "testuser"}
+        second.json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_is_per_token(self):
+        """Test that a response cached for one token is not used for another."""
+        first = AsyncMock()
+        first.status = 200
+        first.headers = {"ETag": '"etag1"'}
+        first.json = AsyncMock(return_value={"login": "testuser"})
+        await _get_json(
+            _mock_session(first), "https://api.github.com/user", "token", {}, _body
+        )
+
+        second = AsyncMock()
+        second.status = 401
+        second.headers = {}
+        session = _mock_session(second)
+        status, _, data = await _get_json(
+            session, "https://api.github.com/user", "other_token", {}, _body
+        )
+
+        assert "If-None-Match" not in session.get.call_args[1]["headers"]
+        assert status == 401
+        assert data is None
+        assert "token" not in repr(github_api._response_cache.keys())
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_not_revalidated(self):
+        """Test that entries older than the maximum age are dropped."""
+        first = AsyncMock()
+        first.status = 200
+        first.headers = {"ETag": '"etag1"'}
+        first.json = AsyncMock(return_value={"login": "testuser"})
+        with patch.object(github_api.time, "monotonic", return_value=0.0):
+            await _get_json(
+                _mock_session(first), "https://api.github.com/user", "token", {}, _body
+            )
+
+        session = _mock_session(first)
+        with patch.object(
+            github_api.time,
+            "monotonic",
+            return_value=github_api.RESPONSE_CACHE_MAX_AGE,
+        ):
+            await _get_json(session, "https://api.github.com/user", "token", {}, _body)
+
+        assert "If-None-Match" not in session.get.call_args[1]["headers"]
+
+    @pytest.mark.asyncio
+    async def test_caches_only_the_parsed_result(self):
+        """Test that the cache keeps what parse returns, not the raw body."""
+        first = AsyncMock()
+        first.status = 200
+        first.headers = {"ETag": '"etag1"'}
+        first.json = AsyncMock(return_value={"login": "testuser", "id": 1})
+        await _get_json(
+            _mock_session(first),
+            "https://api.github.com/user",
+            "token",
+            {},
+            lambda headers, data: data["login"],
+        )
+
+        second = AsyncMock()
+        second.status = 304
+        second.headers = {}
+        parse = MagicMock()
+        status, _, login = await _get_json(
+            _mock_session(second), "https://api.github.com/user", "token", {}, parse
+        )
+
+        assert status == 200
+        assert login == "testuser"
+        parse.assert_not_called()
+        assert [entry[1] for entry in github_api._response_cache.values()] == [
+            "testuser"
+        ]
+
+
+class TestGetBranchHead:
+    """Test the get_branch_head function."""
+
+    @pytest.mark.asyncio
+    async def test_returns_sha_and_etag(self):
+        """Test that a 200 response returns the SHA and ETag."""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.text = AsyncMock(return_value="abc123\n")
+        mock_response.headers = {"ETag": '"etag1"'}
+        session = _mock_session(mock_response)
+
+        result = await get_branch_head(session, "token", "owner", "repo", "main")
+
+        assert result.sha == "abc123"
+        assert result.etag == '"etag1"'
+        assert result.not_modified is False
+        assert result.error == GitHubError.NONE
+
+    @pytest.mark.asyncio
+    async def test_sends_if_none_match(self):
+        """Test that a cached ETag is sent and a 304 is reported."""
+        mock_response = AsyncMock()
+        mock_response.headers = {}
+        mock_response.status = 304
+        session = _mock_session(mock_response)
+
+        result = await get_branch_head(
+            session, "token", "owner", "repo", "main", etag='"etag1"'
+        )
+
+        headers = session.get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"etag1"'
+        assert result.not_modified is True
+        assert result.etag == '"etag1"'
+
+    @pytest.mark.asyncio
+    async def test_not_found(self):
+        """Test that a 404 reports the repository as not found."""
+        mock_response = AsyncMock()
+        mock_response.headers = {}
+        mock_response.status = 404
+        session = _mock_session(mock_response)
+
+        result = await get_branch_head(session, "token", "owner", "repo", "main")
+
+        assert result.error == GitHubError.REPO_NOT_FOUND
+        assert result.sha is None
+
+    @pytest.mark.asyncio
+    async def test_network_error(self):
+        """Test that a client error is reported as a network error."""
+        session = MagicMock()
+        session.get = MagicMock(side_effect=aiohttp.ClientError("boom"))
+
+        result = await get_branch_head(session, "token", "owner", "repo", "main")
+
+        assert result.error == GitHubError.NETWORK_ERROR
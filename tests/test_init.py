@@ -3,13 +3,20 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
+from homeassistant.core import CoreState
+
 from custom_components.private_repo_loader import (
+    _async_register_services,
+    _async_update_listener,
+    async_migrate_entry,
     async_setup,
     async_setup_entry,
     async_unload_entry,
 )
+from custom_components.private_repo_loader.loader import SyncResult
 from custom_components.private_repo_loader.const import (
     DOMAIN,
+    DATA_COORDINATORS,
     SERVICE_SYNC_NOW,
     SERVICE_RELOAD_REPOS,
     CONF_REPO,
@@ -25,7 +32,9 @@ def mock_hass():
     """Create a mock Home Assistant instance."""
     hass = MagicMock()
     hass.config.path = lambda x: f"/tmp/test_config/{x}"
+    hass.data = {}
     hass.is_running = True
+    hass.state = CoreState.running
     hass.bus.async_listen_once = MagicMock()
     hass.services.async_register = MagicMock()
     hass.services.has_service = MagicMock(return_value=False)
@@ -61,13 +70,23 @@ def mock_config_entry():
 
 
 @pytest.mark.asyncio
-async def test_async_setup():
+async def test_async_setup(mock_hass):
     """Test that async_setup returns True."""
-    hass = MagicMock()
-    result = await async_setup(hass, {})
+    result = await async_setup(mock_hass, {})
     assert result is True
 
 
+@pytest.mark.asyncio
+async def test_async_setup_registers_services(mock_hass):
+    """Test that services are registered once when the integration loads."""
+    await async_setup(mock_hass, {})
+
+    call_args_list = mock_hass.services.async_register.call_args_list
+    registered_services = [(call[0][0], call[0][1]) for call in call_args_list]
+    assert (DOMAIN, SERVICE_SYNC_NOW) in registered_services
+    assert (DOMAIN, SERVICE_RELOAD_REPOS) in registered_services
+
+
 @pytest.mark.asyncio
 async def test_async_setup_entry(mock_hass, mock_config_entry):
     """Test setting up the integration from config entry."""
@@ -75,7 +94,7 @@ async def test_async_setup_entry(mock_hass, mock_config_entry):
 
     with (
         patch(
-            "custom_components.private_repo_loader.coordinator.PrivateRepoCoordinator"
+            "custom_components.private_repo_loader.PrivateRepoCoordinator"
         ) as mock_coordinator_class,
         patch("custom_components.private_repo_loader.async_create"),
     ):
@@ -88,36 +107,12 @@ async def test_async_setup_entry(mock_hass, mock_config_entry):
         result = await async_setup_entry(mock_hass, mock_config_entry)
 
         assert result is True
-        mock_hass.services.async_register.assert_called()
+        mock_hass.services.async_register.assert_not_called()
+        coordinators = mock_hass.data[DOMAIN][DATA_COORDINATORS]
+        assert coordinators[mock_config_entry.entry_id] is mock_coordinator
         mock_hass.config_entries.async_forward_entry_setups.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_async_setup_entry_registers_services(mock_hass, mock_config_entry):
-    """Test that services are registered."""
-    mock_hass.config_entries.async_forward_entry_setups = AsyncMock(return_value=True)
-
-    with (
-        patch(
-            "custom_components.private_repo_loader.coordinator.PrivateRepoCoordinator"
-        ) as mock_coordinator_class,
-        patch("custom_components.private_repo_loader.async_create"),
-    ):
-        mock_coordinator = MagicMock()
-        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator.current_poll_interval = 1
-        mock_coordinator.data = None
-        mock_coordinator_class.return_value = mock_coordinator
-
-        await async_setup_entry(mock_hass, mock_config_entry)
-
-        # Check that both services were registered
-        call_args_list = mock_hass.services.async_register.call_args_list
-        registered_services = [(call[0][0], call[0][1]) for call in call_args_list]
-        assert (DOMAIN, SERVICE_SYNC_NOW) in registered_services
-        assert (DOMAIN, SERVICE_RELOAD_REPOS) in registered_services
-
-
 @pytest.mark.asyncio
 async def test_async_setup_entry_creates_restart_notification_on_clone(
     mock_hass, mock_config_entry
@@ -221,35 +216,267 @@ async def test_async_setup_entry_no_notification_on_unchanged(
         mock_notification.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_async_setup_entry_defers_sync_until_started(
+    mock_hass, mock_config_entry
+):
+    """Test that the first sync waits for startup to finish."""
+    mock_hass.state = CoreState.not_running
+
+    with (
+        patch(
+            "custom_components.private_repo_loader.PrivateRepoCoordinator"
+        ) as mock_coordinator_class,
+        patch(
+            "custom_components.private_repo_loader.async_at_started"
+        ) as mock_at_started,
+        patch(
+            "custom_components.private_repo_loader.async_call_later"
+        ) as mock_call_later,
+        patch(
+            "custom_components.private_repo_loader.async_create"
+        ) as mock_notification,
+    ):
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_first_sync = AsyncMock()
+        mock_coordinator.repo_url = "https://github.com/owner/repo"
+        mock_coordinator.current_poll_interval = 1
+        mock_coordinator.data = {"status": "cloned"}
+        mock_coordinator_class.return_value = mock_coordinator
+
+        await async_setup_entry(mock_hass, mock_config_entry)
+
+        assert mock_coordinator_class.call_args.kwargs["defer_polling"] is True
+        mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+        mock_notification.assert_not_called()
+
+        # Home Assistant finishes starting, then the staggered delay passes
+        mock_at_started.call_args[0][1](mock_hass)
+        assert 0 <= mock_call_later.call_args[0][1] < 60
+        await mock_call_later.call_args[0][2](None)
+
+        mock_coordinator.async_first_sync.assert_awaited_once()
+        mock_notification.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_setup_entry_polls_only_after_first_sync(
+    mock_hass, mock_config_entry
+):
+    """Test that no poll is scheduled before the deferred first sync."""
+    mock_hass.state = CoreState.not_running
+    mock_hass.is_stopping = False
+    mock_hass.loop.run_in_executor = AsyncMock(
+        return_value=SyncResult(status="cloned", has_changes=True, commit_sha="abc")
+    )
+    mock_config_entry.pref_disable_polling = False
+
+    with (
+        patch(
+            "custom_components.private_repo_loader.async_at_started"
+        ) as mock_at_started,
+        patch(
+            "custom_components.private_repo_loader.async_call_later"
+        ) as mock_call_later,
+        patch(
+            "custom_components.private_repo_loader.async_create"
+        ) as mock_notification,
+    ):
+        await async_setup_entry(mock_hass, mock_config_entry)
+        coordinator = mock_config_entry.runtime_data
+
+        # An entity subscribing during startup must not start the poll timer
+        coordinator.async_add_listener(MagicMock())
+        mock_hass.loop.call_at.assert_not_called()
+
+        mock_at_started.call_args[0][1](mock_hass)
+        await mock_call_later.call_args[0][2](None)
+
+        mock_hass.loop.run_in_executor.assert_awaited_once()
+        mock_notification.assert_called_once()
+        assert "restart" in mock_notification.call_args[0][1].lower()
+        mock_hass.loop.call_at.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_async_unload_entry(mock_hass, mock_config_entry):
     """Test unloading the integration."""
     mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
-    mock_hass.config_entries.async_entries = MagicMock(
-        return_value=[mock_config_entry]
-    )  # Only this entry exists
-    mock_hass.services.has_service = MagicMock(return_value=True)
+    # Only this entry is loaded
+    mock_hass.data[DOMAIN] = {DATA_COORDINATORS: {mock_config_entry.entry_id: None}}
 
-    result = await async_unload_entry(mock_hass, mock_config_entry)
+    with patch(
+        "custom_components.private_repo_loader.async_shutdown_sync_executor"
+    ) as mock_shutdown:
+        result = await async_unload_entry(mock_hass, mock_config_entry)
 
     assert result is True
-    # Services should be removed since this is the last entry
-    mock_hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_SYNC_NOW)
-    mock_hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_RELOAD_REPOS)
+    # Services belong to the integration and outlive its entries
+    mock_hass.services.async_remove.assert_not_called()
+    # The sync pool is released since this is the last entry
+    mock_shutdown.assert_called_once_with(mock_hass)
 
 
 @pytest.mark.asyncio
-async def test_async_unload_entry_keeps_services_with_other_entries(
+async def test_async_unload_entry_keeps_executor_with_other_entries(
     mock_hass, mock_config_entry
 ):
-    """Test that services are kept if there are other entries."""
+    """Test that the sync pool is kept if there are other entries."""
     mock_hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
-    # Two entries exist
-    mock_hass.config_entries.async_entries = MagicMock(
-        return_value=[mock_config_entry, MagicMock()]
+    # Two entries are loaded
+    mock_hass.data[DOMAIN] = {
+        DATA_COORDINATORS: {mock_config_entry.entry_id: None, "other": None}
+    }
+
+    with patch(
+        "custom_components.private_repo_loader.async_shutdown_sync_executor"
+    ) as mock_shutdown:
+        result = await async_unload_entry(mock_hass, mock_config_entry)
+
+    assert result is True
+    mock_shutdown.assert_not_called()
+
+
+def _registered_handler(hass, service):
+    """Return the handler registered for a service."""
+    for call in hass.services.async_register.call_args_list:
+        if call[0][:2] == (DOMAIN, service):
+            return call[0][2]
+    raise AssertionError(f"{service} was not registered")
+
+
+def _load_coordinators(hass, *coordinators):
+    """Record the given coordinators as loaded entries."""
+    hass.data[DOMAIN] = {
+        DATA_COORDINATORS: {
+            f"entry_{index}": coordinator
+            for index, coordinator in enumerate(coordinators)
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_reload_repos_continues_past_failures(mock_hass, caplog):
+    """Test that one failing repo does not stop the others from reloading."""
+    failing = MagicMock(repo_slug="failing")
+    failing.async_force_sync = AsyncMock(side_effect=RuntimeError("boom"))
+    working = MagicMock(repo_slug="working")
+    working.async_force_sync = AsyncMock()
+    _load_coordinators(mock_hass, failing, working)
+
+    _async_register_services(mock_hass)
+    await _registered_handler(mock_hass, SERVICE_RELOAD_REPOS)(MagicMock())
+
+    failing.async_force_sync.assert_awaited_once()
+    working.async_force_sync.assert_awaited_once()
+    errors = [r for r in caplog.records if r.levelname == "ERROR"]
+    assert len(errors) == 1
+    assert "failing: boom" in errors[0].getMessage()
+
+
+@pytest.mark.asyncio
+async def test_sync_now_refreshes_loaded_coordinators(mock_hass):
+    """Test that sync_now refreshes every loaded entry."""
+    first = MagicMock()
+    first.async_request_refresh = AsyncMock()
+    second = MagicMock()
+    second.async_request_refresh = AsyncMock()
+    _load_coordinators(mock_hass, first, second)
+
+    _async_register_services(mock_hass)
+    await _registered_handler(mock_hass, SERVICE_SYNC_NOW)(MagicMock())
+
+    first.async_request_refresh.assert_awaited_once()
+    second.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_services_without_loaded_entries(mock_hass):
+    """Test that services do nothing before any entry is loaded."""
+    _async_register_services(mock_hass)
+    await _registered_handler(mock_hass, SERVICE_SYNC_NOW)(MagicMock())
+    await _registered_handler(mock_hass, SERVICE_RELOAD_REPOS)(MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_update_listener_ignores_data_writes(mock_hass, mock_config_entry):
+    """Test that writes to entry.data alone do not reload the entry."""
+    mock_config_entry.runtime_data = MagicMock(
+        loaded_options=dict(mock_config_entry.options)
     )
 
-    result = await async_unload_entry(mock_hass, mock_config_entry)
+    await _async_update_listener(mock_hass, mock_config_entry)
+
+    mock_hass.config_entries.async_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_listener_reloads_on_options_change(mock_hass, mock_config_entry):
+    """Test that changed options reload the entry."""
+    mock_config_entry.runtime_data = MagicMock(
+        loaded_options={**mock_config_entry.options, CONF_BRANCH: "dev"}
+    )
+
+    await _async_update_listener(mock_hass, mock_config_entry)
+
+    mock_hass.config_entries.async_reload.assert_called_once_with(
+        mock_config_entry.entry_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_migrate_v1_entry_splits_repositories(mock_hass):
+    """Test that a v1 entry is split into one import flow per repository."""
+    mock_hass.config_entries.flow.async_init = AsyncMock()
+    mock_hass.config_entries.async_remove = MagicMock()
+    entry = MagicMock()
+    entry.version = 1
+    entry.entry_id = "v1_entry"
+    entry.data = {CONF_TOKEN: "shared_token"}
+    entry.options = {
+        "repos": [
+            {CONF_REPO: "https://github.com/owner/one", "slug": "one"},
+            {CONF_REPO: "https://github.com/owner/two", CONF_TOKEN: "own_token"},
+            {"slug": "no_url"},
+        ]
+    }
+
+    result = await async_migrate_entry(mock_hass, entry)
 
     assert result is True
-    mock_hass.services.async_remove.assert_not_called()
+    imported = [
+        call.kwargs["data"]
+        for call in mock_hass.config_entries.flow.async_init.await_args_list
+    ]
+    assert [data[CONF_REPO] for data in imported] == [
+        "https://github.com/owner/one",
+        "https://github.com/owner/two",
+    ]
+    assert imported[0][CONF_TOKEN] == "shared_token"
+    assert imported[1][CONF_TOKEN] == "own_token"
+    mock_hass.config_entries.async_update_entry.assert_called_once_with(
+        entry, data={}, options={}, version=2
+    )
+    # Removed once setup has released the entry
+    mock_hass.config_entries.async_remove.assert_called_once_with("v1_entry")
+    assert (
+        mock_hass.async_create_task.call_args[0][0]
+        is mock_hass.config_entries.async_remove.return_value
+    )
+
+
+@pytest.mark.asyncio
+async def test_migrated_v1_entry_is_not_set_up(mock_hass, mock_config_entry):
+    """Test that the emptied v1 entry sets up and unloads nothing."""
+    mock_config_entry.data = {}
+
+    with patch(
+        "custom_components.private_repo_loader.PrivateRepoCoordinator"
+    ) as mock_coordinator_class:
+        assert await async_setup_entry(mock_hass, mock_config_entry) is True
+        assert await async_unload_entry(mock_hass, mock_config_entry) is True
+
+    mock_coordinator_class.assert_not_called()
+    mock_hass.config_entries.async_forward_entry_setups.assert_not_called()
+    mock_hass.config_entries.async_unload_platforms.assert_not_called()
@@ -2,10 +2,12 @@
 
 from pathlib import Path
 import json
+import subprocess
 
 import git
 import pytest
 
+from custom_components.private_repo_loader import loader
 from custom_components.private_repo_loader.loader import (
     sync_repo,
     sync_repo_detailed,
@@ -170,6 +172,89 @@ def test_sync_no_changes(tmp_repo: Path, tmp_config: Path) -> None:
     assert result.has_changes is False
 
 
+def test_sync_follows_changed_url(tmp_repo: Path, tmp_config: Path) -> None:
+    """sync_repo_detailed should point the clone at a changed repository URL."""
+    cfg = {
+        "repository": tmp_repo.as_uri(),
+        "slug": "testrepo",
+        "branch": "main",
+        "token": "",
+    }
+    sync_repo_detailed(tmp_config, cfg)
+
+    moved = tmp_repo.with_name("moved")
+    tmp_repo.rename(moved)
+    result = sync_repo_detailed(tmp_config, {**cfg, "repository": moved.as_uri()})
+
+    assert result.status == "unchanged"
+    staging = git.Repo(_get_staging_path(tmp_config.parent, "testrepo"))
+    assert staging.remote().url == moved.as_uri()
+
+
+def test_sync_full_history_option(tmp_repo: Path, tmp_config: Path) -> None:
+    """Clones should be shallow unless full_history is set."""
+    upstream = git.Repo(tmp_repo)
+    (tmp_repo / "CHANGELOG.md").write_text("# changes")
+    upstream.index.add(["CHANGELOG.md"])
+    upstream.index.commit("second")
+    cfg = {
+        "repository": tmp_repo.as_uri(),
+        "slug": "testrepo",
+        "branch": "main",
+        "token": "",
+    }
+    staging = _get_staging_path(tmp_config.parent, "testrepo")
+
+    sync_repo_detailed(tmp_config, cfg)
+    assert (staging / ".git" / "shallow").exists()
+
+    sync_repo_detailed(tmp_config, {**cfg, "full_history": True})
+    assert not (staging / ".git" / "shallow").exists()
+    assert len(list(git.Repo(staging).iter_commits())) == 2
+
+
+def test_credential_helper_supplies_token() -> None:
+    """The credential helper should answer git with the token from the env."""
+    proc = subprocess.run(
+        ["git", *loader._CREDENTIAL_ARGS, "credential", "fill"],
+        input="protocol=https\nhost=github.com\n\n",
+        env={**loader._GIT_ENV, loader._TOKEN_ENV: "secret$token"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert "username=x-access-token" in proc.stdout
+    assert "password=secret$token" in proc.stdout
+
+
+def test_git_timeout_raises_git_command_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A git command that runs too long should fail like any other git error."""
+
+    def _run(cmd, **kwargs):
+        assert kwargs["timeout"] == loader.GIT_COMMAND_TIMEOUT
+        raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+    monkeypatch.setattr(loader.subprocess, "run", _run)
+
+    with pytest.raises(loader.GitCommandError, match="timed out"):
+        loader._run_git("fetch", "origin")
+
+
+def test_sync_missing_remote(tmp_path: Path, tmp_config: Path) -> None:
+    """sync_repo_detailed should report a failed clone instead of raising."""
+    cfg = {
+        "repository": (tmp_path / "missing").as_uri(),
+        "slug": "testrepo",
+        "branch": "main",
+        "token": "",
+    }
+
+    result = sync_repo_detailed(tmp_config, cfg)
+    assert result.status == "skipped"
+    assert result.error is not None
+
+
 def test_sync_empty_url(tmp_path: Path) -> None:
     """sync_repo should handle empty URL gracefully."""
     cfg = {
@@ -54,6 +54,11 @@ class TestParseGitError:
         )
         assert error_type == "network"
 
+    def test_timed_out(self):
+        """Test parsing a git command that timed out."""
+        error_type, _ = _parse_git_error("git timed out after 600 seconds")
+        assert error_type == "network"
+
     def test_unknown_error(self):
         """Test parsing unknown error."""
         error_type, message = _parse_git_error("Some random error")